@@ -0,0 +1,106 @@
+"""Measures the role checks for a member with 200 roles.
+
+The checks are compared with resolving the Role objects of the member,
+which is how the role checks were evaluated before.
+
+    python benchmarks/role_checks.py
+"""
+
+import asyncio
+import functools
+import timeit
+
+import discord
+
+from discord.ext import interaction
+
+ROLE_COUNT = 200
+GUILD_ID = 100
+NUMBER = 2000
+
+
+def get_client() -> interaction.Client:
+    client = interaction.Client()
+    roles = [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0"}]
+    roles.extend(
+        {"id": str(1000 + index), "name": f"role-{index}", "permissions": "0"}
+        for index in range(ROLE_COUNT)
+    )
+    client._connection._add_guild_from_data(
+        {"id": str(GUILD_ID), "name": "benchmark", "roles": roles, "members": []}
+    )
+    return client
+
+
+def get_context(client: interaction.Client) -> interaction.InteractionContext:
+    payload = {
+        "id": "1100000000000000000",
+        "type": 2,
+        "token": "token",
+        "application_id": "1",
+        "guild_id": str(GUILD_ID),
+        "channel_id": "2",
+        "member": {
+            "user": {
+                "id": "3",
+                "username": "user",
+                "discriminator": "0",
+                "avatar": None,
+            },
+            "roles": [str(1000 + index) for index in range(ROLE_COUNT)],
+            "joined_at": None,
+            "flags": 0,
+            "permissions": "0",
+        },
+        "data": {"id": "4", "name": "command", "type": 1},
+    }
+    return interaction.ApplicationContext(payload, client)
+
+
+def resolve_roles(ctx: interaction.InteractionContext, *items) -> bool:
+    getter = functools.partial(discord.utils.get, ctx.author.roles)
+    return any(
+        (
+            getter(id=item) is not None
+            if isinstance(item, int)
+            else getter(name=item) is not None
+        )
+        for item in items
+    )
+
+
+def main():
+    client = get_client()
+    # The last role of the member, so every role is visited.
+    items = (1, 2, 1000 + ROLE_COUNT - 1)
+    predicate = interaction.has_any_role(*items).predicate
+    loop = asyncio.new_event_loop()
+
+    async def evaluate_checks(ctx):
+        # has_any_role evaluated 3 times per interaction.
+        for _ in range(3):
+            await predicate(ctx)
+
+    def run_context():
+        get_context(client)
+
+    def run_check():
+        loop.run_until_complete(evaluate_checks(get_context(client)))
+
+    def run_resolve():
+        ctx = get_context(client)
+        for _ in range(3):
+            resolve_roles(ctx, *items)
+
+    for name, func in (
+        ("context only", run_context),
+        ("has_any_role", run_check),
+        ("resolve roles", run_resolve),
+    ):
+        seconds = timeit.timeit(func, number=NUMBER)
+        print(f"{name}: {seconds / NUMBER * 1e6:.1f}us per interaction")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ __version__ = "0.6.2"  # version_info.to_string()
 
 from typing import NamedTuple, Literal, Optional
 
+from .cache import PayloadCache
 from .client import Client, AutoShardedClient
 from .checks import *
 from .commands import (
@@ -54,6 +55,16 @@ from .core import (
     user,
     context,
 )
+from .cooldown import (
+    BucketType,
+    CooldownBucket,
+    CooldownStorage,
+    MaxConcurrency,
+    MemoryCooldownStorage,
+    SQLiteCooldownStorage,
+    cooldown,
+    max_concurrency,
+)
 from .components import (
     Components,
     ActionRow,
@@ -64,6 +75,14 @@ from .components import (
     DetectComponent,
     detect_component,
 )
+from .diff import (
+    CommandChange,
+    CommandDiff,
+    FieldChange,
+    diff_command,
+    diff_commands,
+    normalize_command,
+)
 from .errors import InvalidArgument, AlreadyDeferred
 from .interaction import (
     InteractionContext,
@@ -72,9 +91,15 @@ from .interaction import (
     ComponentsContext,
     AutocompleteContext,
     ModalContext,
+    PartialGuild,
+    PartialMember,
 )
 from .message import Message, MessageTransferable, MessageEditable
 from .listener import listener
+from .routing import CustomIdPattern, CustomIdRouter
+from .lock import SyncLock, FileSyncLock, TCPSyncLock
+from .sync import SyncOperation, SyncReport
+from .waiter import ComponentStream
 
 
 class VersionInfo(NamedTuple):
@@ -0,0 +1,127 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import OrderedDict
+
+import discord
+from discord.state import ConnectionState
+
+
+class PayloadCache:
+    """Writes the members and users included in interaction payloads
+    through to the caches of :class:`discord.state.ConnectionState`.
+
+    Only entities inserted by this cache are tracked, and the least recently seen
+    entities are evicted when ``max_size`` is exceeded.
+    Members already cached by discord.py (e.g. from chunking) are never replaced or evicted.
+
+    Parameters
+    ----------
+    state: ConnectionState
+        The connection state of the client.
+    max_size: int
+        The maximum number of members and users kept alive by this cache.
+    """
+
+    def __init__(self, state: ConnectionState, max_size: int = 1000):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        self._state = state
+        self.max_size = max_size
+        self._entries: OrderedDict[
+            tuple[int | None, int], discord.Member | discord.User
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def store(self, payload: dict):
+        """Upsert the ``member``, ``user`` and ``resolved`` data of an interaction payload.
+
+        Parameters
+        ----------
+        payload: dict
+            The raw payload of ``INTERACTION_CREATE``.
+        """
+        guild_id = payload.get("guild_id")
+        guild = None
+        if guild_id is not None:
+            guild = self._state._get_guild(int(guild_id))
+
+        member = payload.get("member")
+        if member is not None and guild is not None:
+            self.store_member(guild, member)
+
+        user = payload.get("user")
+        if user is not None:
+            self.store_user(user)
+
+        resolved = payload.get("data", {}).get("resolved", {})
+        users = resolved.get("users", {})
+        if guild is not None:
+            for user_id, resolved_member in resolved.get("members", {}).items():
+                if user_id not in users:
+                    continue
+                self.store_member(guild, dict(resolved_member, user=users[user_id]))
+        for resolved_user in users.values():
+            self.store_user(resolved_user)
+
+    def store_member(self, guild: discord.Guild, data: dict) -> discord.Member | None:
+        user_id = int(data["user"]["id"])
+        key = (guild.id, user_id)
+        cached = guild.get_member(user_id)
+        if cached is not None and self._entries.get(key) is not cached:
+            # The member has been cached by discord.py itself.
+            return cached
+
+        member = discord.Member(data=data, guild=guild, state=self._state)
+        guild._add_member(member)
+        self._put(key, member)
+        return member
+
+    def store_user(self, data: dict) -> discord.User:
+        # ConnectionState.store_user does not cache users without the members intent,
+        # so the user is inserted into the user cache directly.
+        user_id = int(data["id"])
+        user = self._state._users.get(user_id)
+        if user is None:
+            user = discord.User(state=self._state, data=data)
+            self._state._users[user_id] = user
+        self._put((None, user_id), user)
+        return user
+
+    def _put(self, key: tuple[int | None, int], value: discord.Member | discord.User):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._evict(*self._entries.popitem(last=False))
+
+    def _evict(self, key: tuple[int | None, int], value: discord.Member | discord.User):
+        guild_id, user_id = key
+        if guild_id is None:
+            # Users are kept alive by a strong reference only, ConnectionState holds them weakly.
+            return
+
+        guild = self._state._get_guild(guild_id)
+        if guild is not None and guild.get_member(user_id) is value:
+            guild._remove_member(value)
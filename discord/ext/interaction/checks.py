@@ -23,18 +23,33 @@ SOFTWARE.
 
 import functools
 import inspect
+from collections.abc import Collection
 from typing import Callable
 
 import discord.utils
 from discord.ext.commands.errors import *
 
-from .core import BaseCommand
+from .core import BaseCore
 from .interaction import InteractionContext
 
 
-def check(predicate):
+def check(predicate, *, ordered: bool = False):
+    """A decorator that adds a check to the command or detect component.
+
+    Parameters
+    ----------
+    predicate: Callable[[:class:`InteractionContext`], :class:`bool`]
+        The predicate to check if the command should be invoked.
+    ordered: bool
+        When the client evaluates checks concurrently (``concurrent_checks``),
+        an ordered check waits for all the checks before it, and the checks after it wait for it.
+        This defaults to ``False``.
+    """
+    if ordered:
+        predicate.__check_ordered__ = True
+
     def decorator(func):
-        if isinstance(func, BaseCommand):
+        if isinstance(func, BaseCore):
             func.checks.append(predicate)
         else:
             if not hasattr(func, "__commands_checks__"):
@@ -126,6 +141,33 @@ def check_any(*checks) -> Callable:
     return check(predicate)
 
 
+def _split_roles(items) -> tuple[frozenset[int], frozenset[str]]:
+    ids = frozenset(item for item in items if isinstance(item, int))
+    names = frozenset(item for item in items if not isinstance(item, int))
+    return ids, names
+
+
+def _has_any_role(
+    member, role_ids: Collection[int], ids: frozenset[int], names: frozenset[str]
+) -> bool:
+    if not ids.isdisjoint(role_ids):
+        return True
+    if names and isinstance(member, discord.Member):
+        # Role names are not sent with the interaction, so they are looked up in the cache.
+        return any(role.name in names for role in member.roles)
+    return False
+
+
+def _bot_has_any_role(
+    ctx: InteractionContext, ids: frozenset[int], names: frozenset[str]
+) -> bool:
+    me = ctx.me
+    if not isinstance(me, discord.Member):
+        return False
+    # The bot always has the @everyone role, whose id is the guild id.
+    return ctx.guild_id in ids or _has_any_role(me, me._roles, ids, names)
+
+
 def has_role(item: int | str) -> Callable:
     """A :func:`.check` that is added that checks if the member invoking the
     command has the role specified via the name or ID specified.
@@ -148,16 +190,13 @@ def has_role(item: int | str) -> Callable:
         The name or ID of the role to check.
     """
 
+    ids, names = _split_roles((item,))
+
     def predicate(ctx: InteractionContext) -> bool:
         if ctx.guild is None:
             raise NoPrivateMessage()
 
-        # ctx.guild is None doesn't narrow ctx.author to Member
-        if isinstance(item, int):
-            role = discord.utils.get(ctx.author.roles, id=item)  # type: ignore
-        else:
-            role = discord.utils.get(ctx.author.roles, name=item)  # type: ignore
-        if role is None:
+        if not _has_any_role(ctx.author, ctx.author_role_ids, ids, names):
             raise MissingRole(item)
         return True
 
@@ -191,20 +230,13 @@ def has_any_role(*items: int | str) -> Callable:
             await ctx.send('You are cool indeed')
     """
 
+    ids, names = _split_roles(items)
+
     def predicate(ctx):
         if ctx.guild is None:
             raise NoPrivateMessage()
 
-        # ctx.guild is None doesn't narrow ctx.author to Member
-        getter = functools.partial(discord.utils.get, ctx.author.roles)  # type: ignore
-        if any(
-            (
-                getter(id=item) is not None
-                if isinstance(item, int)
-                else getter(name=item) is not None
-            )
-            for item in items
-        ):
+        if _has_any_role(ctx.author, ctx.author_role_ids, ids, names):
             return True
         raise MissingAnyRole(list(items))
 
@@ -220,16 +252,13 @@ def bot_has_role(item: int) -> Callable:
     Both inherit from :exc:`.CheckFailure`.
     """
 
+    ids, names = _split_roles((item,))
+
     def predicate(ctx):
         if ctx.guild is None:
             raise NoPrivateMessage()
 
-        me = ctx.me
-        if isinstance(item, int):
-            role = discord.utils.get(me.roles, id=item)
-        else:
-            role = discord.utils.get(me.roles, name=item)
-        if role is None:
+        if not _bot_has_any_role(ctx, ids, names):
             raise BotMissingRole(item)
         return True
 
@@ -245,32 +274,49 @@ def bot_has_any_role(*items: int) -> Callable:
     Both inherit from :exc:`.CheckFailure`.
     """
 
+    ids, names = _split_roles(items)
+
     def predicate(ctx):
         if ctx.guild is None:
             raise NoPrivateMessage()
 
-        me = ctx.me
-        getter = functools.partial(discord.utils.get, me.roles)
-        if any(
-            (
-                getter(id=item) is not None
-                if isinstance(item, int)
-                else getter(name=item) is not None
-            )
-            for item in items
-        ):
+        if _bot_has_any_role(ctx, ids, names):
             return True
         raise BotMissingAnyRole(list(items))
 
     return check(predicate)
 
 
+def _compile_permissions(perms: dict[str, bool]) -> tuple[int, int]:
+    invalid = set(perms) - set(discord.Permissions.VALID_FLAGS)
+    if invalid:
+        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+
+    allowed = denied = 0
+    for perm, value in perms.items():
+        if value:
+            allowed |= discord.Permissions.VALID_FLAGS[perm]
+        else:
+            denied |= discord.Permissions.VALID_FLAGS[perm]
+    return allowed, denied
+
+
+def _missing_permissions(permissions: int, perms: dict[str, bool]) -> list[str]:
+    return [
+        perm
+        for perm, value in perms.items()
+        if bool(permissions & discord.Permissions.VALID_FLAGS[perm]) != value
+    ]
+
+
 def has_permissions(**perms: bool) -> Callable:
     """A :func:`.check` that is added that checks if the member has all of
     the permissions necessary.
 
     Note that this check operates on the current channel permissions, not the
     guild wide permissions.
+    The permissions sent with the interaction (``member.permissions``) are used when present,
+    otherwise they are computed from the cached channel.
 
     The permissions passed in must be exactly like the properties shown under
     :class:`.discord.Permissions`.
@@ -295,22 +341,18 @@ def has_permissions(**perms: bool) -> Callable:
 
     """
 
-    invalid = set(perms) - set(discord.Permissions.VALID_FLAGS)
-    if invalid:
-        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+    allowed, denied = _compile_permissions(perms)
 
     def predicate(ctx: InteractionContext) -> bool:
-        ch = ctx.channel
-        permissions = ch.permissions_for(ctx.author)  # type: ignore
-
-        missing = [
-            perm for perm, value in perms.items() if getattr(permissions, perm) != value
-        ]
+        permissions = ctx.permissions
+        if permissions is None:
+            permissions = ctx.channel.permissions_for(ctx.author)  # type: ignore
 
-        if not missing:
+        value = permissions.value
+        if value & allowed == allowed and not value & denied:
             return True
 
-        raise MissingPermissions(missing)
+        raise MissingPermissions(_missing_permissions(value, perms))
 
     return check(predicate)
 
@@ -318,28 +360,24 @@ def has_permissions(**perms: bool) -> Callable:
 def bot_has_permissions(**perms: bool) -> Callable:
     """Similar to :func:`.has_permissions` except checks if the bot itself has
     the permissions listed.
+    The permissions sent with the interaction (``app_permissions``) are used when present.
 
     This check raises a special exception, :exc:`.BotMissingPermissions`
     that is inherited from :exc:`.CheckFailure`.
     """
 
-    invalid = set(perms) - set(discord.Permissions.VALID_FLAGS)
-    if invalid:
-        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+    allowed, denied = _compile_permissions(perms)
 
     def predicate(ctx: InteractionContext) -> bool:
-        guild = ctx.guild
-        me = guild.me if guild is not None else ctx.client.user
-        permissions = ctx.channel.permissions_for(me)  # type: ignore
+        permissions = ctx.app_permissions
+        if permissions is None:
+            permissions = ctx.channel.permissions_for(ctx.me)  # type: ignore
 
-        missing = [
-            perm for perm, value in perms.items() if getattr(permissions, perm) != value
-        ]
-
-        if not missing:
+        value = permissions.value
+        if value & allowed == allowed and not value & denied:
             return True
 
-        raise BotMissingPermissions(missing)
+        raise BotMissingPermissions(_missing_permissions(value, perms))
 
     return check(predicate)
 
@@ -348,27 +386,30 @@ def has_guild_permissions(**perms: bool) -> Callable:
     """Similar to :func:`.has_permissions`, but operates on guild wide
     permissions instead of the current channel permissions.
 
+    When the guild is not in the cache (e.g. ``cacheless_context``), the permissions sent
+    with the interaction are used instead. These are the permissions in the channel of the
+    interaction, including its overwrites, so the check is not guild wide in that case.
+
     If this check is called in a DM context, it will raise an
     exception, :exc:`.NoPrivateMessage`.
     """
 
-    invalid = set(perms) - set(discord.Permissions.VALID_FLAGS)
-    if invalid:
-        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+    allowed, denied = _compile_permissions(perms)
 
     def predicate(ctx: InteractionContext) -> bool:
         if not ctx.guild:
             raise NoPrivateMessage
 
-        permissions = ctx.author.guild_permissions  # type: ignore
-        missing = [
-            perm for perm, value in perms.items() if getattr(permissions, perm) != value
-        ]
+        if isinstance(ctx.guild, discord.Guild) or ctx.permissions is None:
+            permissions = ctx.author.guild_permissions  # type: ignore
+        else:
+            permissions = ctx.permissions
 
-        if not missing:
+        value = permissions.value
+        if value & allowed == allowed and not value & denied:
             return True
 
-        raise MissingPermissions(missing)
+        raise MissingPermissions(_missing_permissions(value, perms))
 
     return check(predicate)
 
@@ -376,25 +417,28 @@ def has_guild_permissions(**perms: bool) -> Callable:
 def bot_has_guild_permissions(**perms: bool) -> Callable:
     """Similar to :func:`.has_guild_permissions`, but checks the bot
     members guild permissions.
+
+    When the guild is not in the cache (e.g. ``cacheless_context``), the permissions of the bot
+    sent with the interaction are used instead. These are the permissions in the channel of the
+    interaction, including its overwrites, so the check is not guild wide in that case.
     """
 
-    invalid = set(perms) - set(discord.Permissions.VALID_FLAGS)
-    if invalid:
-        raise TypeError(f"Invalid permission(s): {', '.join(invalid)}")
+    allowed, denied = _compile_permissions(perms)
 
     def predicate(ctx: InteractionContext) -> bool:
         if not ctx.guild:
             raise NoPrivateMessage
 
-        permissions = ctx.me.guild_permissions  # type: ignore
-        missing = [
-            perm for perm, value in perms.items() if getattr(permissions, perm) != value
-        ]
+        if isinstance(ctx.guild, discord.Guild) or ctx.app_permissions is None:
+            permissions = ctx.me.guild_permissions  # type: ignore
+        else:
+            permissions = ctx.app_permissions
 
-        if not missing:
+        value = permissions.value
+        if value & allowed == allowed and not value & denied:
             return True
 
-        raise BotMissingPermissions(missing)
+        raise BotMissingPermissions(_missing_permissions(value, perms))
 
     return check(predicate)
 
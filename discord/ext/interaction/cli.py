@@ -0,0 +1,243 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import discord
+
+from .client import Client
+from .diff import CommandDiff, diff_commands
+from .manifest import get_manifest
+
+TOKEN_ENVIRONMENT = "DISCORD_TOKEN"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m discord.ext.interaction",
+        description="Manages application commands without connecting to the gateway.",
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    extension_parser = argparse.ArgumentParser(add_help=False)
+    extension_parser.add_argument(
+        "extensions",
+        nargs="*",
+        metavar="EXTENSION",
+        help="The extensions to load, e.g. cogs.ping",
+    )
+    extension_parser.add_argument(
+        "-p",
+        "--package",
+        action="append",
+        default=[],
+        help="Load all extensions in the package, like Client.load_extensions.",
+    )
+    extension_parser.add_argument(
+        "-d",
+        "--directory",
+        default=None,
+        help="The directory containing the packages given by --package.",
+    )
+
+    api_parser = argparse.ArgumentParser(add_help=False)
+    api_parser.add_argument(
+        "--token",
+        default=None,
+        help=f"The bot token. Defaults to the {TOKEN_ENVIRONMENT} environment variable.",
+    )
+    api_parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="Delete remote commands that are not in the manifest.",
+    )
+    api_parser.add_argument(
+        "-g",
+        "--guild",
+        type=int,
+        action="append",
+        default=[],
+        help="Also compare the guild without local commands, e.g. to delete its commands.",
+    )
+
+    manifest_parser = subparsers.add_parser(
+        "manifest",
+        parents=[extension_parser],
+        help="Print the manifest of the application commands as JSON.",
+    )
+    manifest_parser.add_argument(
+        "-o", "--output", default=None, help="Write the manifest to the file."
+    )
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        parents=[extension_parser, api_parser],
+        help="Show the changes between the local commands and a manifest or Discord. "
+        "Exits with 1 if there are changes.",
+    )
+    diff_parser.add_argument(
+        "-m",
+        "--manifest",
+        default=None,
+        help="Compare with the manifest file instead of the commands registered in Discord.",
+    )
+
+    subparsers.add_parser(
+        "sync",
+        parents=[extension_parser, api_parser],
+        help="Apply the changes to Discord through the REST API.",
+    )
+    return parser
+
+
+def load_client(args: argparse.Namespace) -> Client:
+    """Creates a client and loads the extensions given by the arguments.
+    The client does not connect to Discord.
+    """
+    # Extensions are imported like `python -m`, relative to the working directory.
+    for path in [os.getcwd(), args.directory]:
+        if path is not None and path not in sys.path:
+            sys.path.insert(0, path)
+
+    client = Client(intents=discord.Intents.none())
+    for package in args.package:
+        client.load_extensions(package, args.directory)
+    for extension in args.extensions:
+        client.load_extension(extension)
+    return client
+
+
+def group_manifest(manifest: list[dict]) -> dict[int | None, list[dict]]:
+    """Groups the manifest by the guild id of commands. ``None`` is the global scope."""
+    scopes = dict()
+    for data in manifest:
+        guild_id = data.get("guild_id")
+        scopes.setdefault(None if guild_id is None else int(guild_id), []).append(data)
+    return scopes
+
+
+def print_diff(guild_id: int | None, diff: CommandDiff):
+    scope = "Global commands" if guild_id is None else f"Commands of guild {guild_id}"
+    print(f"{scope}: {diff.report()}")
+
+
+async def fetch_diff(
+    client: Client, manifest: list[dict], guilds: list[int], delete_missing: bool
+) -> dict[int | None, CommandDiff]:
+    local = group_manifest(manifest)
+    scopes = dict.fromkeys([None, *local.keys(), *guilds])
+    remote = await asyncio.gather(
+        *[client.fetch_commands(guild_id) for guild_id in scopes]
+    )
+    result = dict()
+    for guild_id, fetch_data in zip(scopes, remote):
+        result[guild_id] = diff_commands(
+            local.get(guild_id, []),
+            [x for commands in fetch_data for x in commands.values()],
+            delete_missing=delete_missing,
+        )
+    return result
+
+
+async def run_api(
+    client: Client, manifest: list[dict], args: argparse.Namespace
+) -> int:
+    token = args.token or os.environ.get(TOKEN_ENVIRONMENT)
+    if not token:
+        print(
+            f"error: a token is required. Use --token or set {TOKEN_ENVIRONMENT}.",
+            file=sys.stderr,
+        )
+        return 2
+
+    async with client:
+        # Only the REST API is used; login does not open a gateway session.
+        await client.login(token)
+        diffs = await fetch_diff(client, manifest, args.guild, args.delete_missing)
+        for guild_id, diff in diffs.items():
+            print_diff(guild_id, diff)
+        if args.action == "diff":
+            return int(any(diffs.values()))
+
+        failed = False
+        semaphore = asyncio.Semaphore(client.sync_concurrency)
+        for guild_id, diff in diffs.items():
+            if not diff:
+                continue
+            report = await client._apply_command_changes(
+                diff.changes, guild_id, semaphore
+            )
+            print(report.summary())
+            failed = failed or len(report.failed) > 0 or len(report.skipped) > 0
+        return int(failed)
+
+
+def run(args: argparse.Namespace) -> int:
+    client = load_client(args)
+    manifest = get_manifest(client.get_interaction())
+
+    if args.action == "manifest":
+        text = json.dumps(manifest, ensure_ascii=False, indent=2)
+        if args.output is None:
+            print(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as fp:
+                fp.write(text + "\n")
+        return 0
+
+    if args.action == "diff" and args.manifest is not None:
+        with open(args.manifest, encoding="utf-8") as fp:
+            saved = group_manifest(json.load(fp))
+        local = group_manifest(manifest)
+        changed = False
+        for guild_id in dict.fromkeys([None, *local.keys(), *saved.keys()]):
+            diff = diff_commands(
+                local.get(guild_id, []),
+                saved.get(guild_id, []),
+                delete_missing=args.delete_missing,
+            )
+            print_diff(guild_id, diff)
+            changed = changed or bool(diff)
+        return int(changed)
+
+    return asyncio.run(run_api(client, manifest, args))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """The entry point of ``python -m discord.ext.interaction``.
+
+    - ``manifest`` prints the canonical manifest of the commands in the extensions.
+    - ``diff`` compares the commands with a saved manifest or the commands registered in Discord.
+    - ``sync`` applies the changes to Discord through the REST API.
+
+    Returns
+    -------
+        The exit status. ``diff`` returns 1 if there are changes,
+        and ``sync`` returns 1 if a change failed.
+    """
+    args = build_parser().parse_args(argv)
+    return run(args)
@@ -22,7 +22,7 @@ SOFTWARE.
 """
 
 import asyncio
-import copy
+import contextlib
 import importlib
 import importlib.machinery
 import importlib.util
@@ -30,18 +30,23 @@ import inspect
 import logging
 import os
 import sys
+import time
 import types
 import zlib
 from typing import Any
 
 import discord.http
+from discord.ext.commands import MaxConcurrencyReached
 from discord.gateway import DiscordWebSocket
 from discord.state import ConnectionState
 
-from ._types import CoroutineFunction, UserCheck, _Coroutine, T
+from ._types import CoroutineFunction, UserCheck, T
+from .cache import PayloadCache
 from .commands import ApplicationCommand, from_payload, command_types
 from .components import DetectComponent
+from .cooldown import update_cooldowns
 from .core import SubCommand, SubCommandGroup, BaseCommand, decorator_command_types
+from .diff import CommandChange, diff_commands
 from .enums import ApplicationCommandType
 from .errors import *
 from .http import InteractionHTTPClient
@@ -50,9 +55,22 @@ from .interaction import (
     ComponentsContext,
     AutocompleteContext,
     ModalContext,
+    SubcommandContext,
+)
+from .lock import SyncLock
+from .manifest import (
+    delete_sync_state,
+    get_command_ids,
+    get_fingerprint,
+    get_manifest,
+    load_sync_state,
+    save_sync_state,
 )
 from .message import Message
-from .utils import _from_json, async_all
+from .routing import CustomIdRouter
+from .sync import CommandCreateQuota, SyncOperation, SyncReport
+from .utils import _from_json, async_all, async_all_concurrent, run_check
+from .waiter import ComponentStream, ComponentWaiter, WaiterRegistry
 
 log = logging.getLogger()
 
@@ -66,6 +84,14 @@ class ClientBase:
         self,
         global_sync_command: bool = False,
         intents: discord.Intents = discord.Intents.default(),
+        cacheless_context: bool = False,
+        payload_cache_size: int | None = None,
+        concurrent_checks: bool = False,
+        bulk_sync_command: bool = False,
+        sync_state_path: str | os.PathLike | None = None,
+        sync_concurrency: int = 4,
+        sync_command_delay: float = 1.0,
+        sync_lock: SyncLock | None = None,
         **options,
     ):
         if discord.version_info.major >= 2:
@@ -73,6 +99,43 @@ class ClientBase:
         super().__init__(intents=intents, **options)
         self.global_sync_command = global_sync_command
 
+        # When cacheless_context is True, the author, guild, channel and permissions of
+        # an interaction context are built from the payload without the client cache.
+        self.cacheless_context = cacheless_context
+
+        # When payload_cache_size is set, members and users in interaction payloads are
+        # written through to the client cache, keeping at most payload_cache_size of them.
+        self.payload_cache: PayloadCache | None = None
+        if payload_cache_size is not None:
+            self.payload_cache = PayloadCache(self._connection, payload_cache_size)
+
+        # When concurrent_checks is True, independent checks are evaluated concurrently.
+        self.concurrent_checks = concurrent_checks
+
+        # When bulk_sync_command is True, commands are synchronized when the bot is ready
+        # by overwriting all application commands in one request.
+        self.bulk_sync_command = bulk_sync_command
+
+        # When sync_state_path is set, the fingerprint of synchronized commands and their ids
+        # are stored in the file, and synchronization is skipped while the fingerprint matches.
+        self.sync_state_path = sync_state_path
+
+        # The maximum number of requests running at the same time while synchronizing commands.
+        self.sync_concurrency = sync_concurrency
+
+        # The daily command creation quota is counted per guild (None for global commands).
+        # It is kept in memory, so it only guards the creations made by this process.
+        self._command_create_quotas: dict[int | None, CommandCreateQuota] = {}
+
+        # Commands added or deleted after the bot is ready are synchronized together
+        # once no change has been made for sync_command_delay seconds.
+        self.sync_command_delay = sync_command_delay
+
+        # When sync_lock is set, only the process acquiring the lock synchronizes commands,
+        # and the other processes load the command ids published by it.
+        self.sync_lock = sync_lock
+        self._sync_leader: bool | None = None
+
         self.__buffer = bytearray()
         self.__zlib = zlib.decompressobj()
 
@@ -85,15 +148,48 @@ class ClientBase:
         ]
         self._fetch_interactions: list[dict[str, ApplicationCommand]] | None = None
 
+        # Guild-scoped commands and the commands fetched from each guild.
+        self._guild_interactions: dict[
+            int, list[dict[str, decorator_command_types]]
+        ] = dict()
+        self._fetch_guild_interactions: dict[
+            int, list[dict[str, ApplicationCommand]]
+        ] = dict()
+        self._fetch_interactions_by_id: dict[int, ApplicationCommand] = dict()
+
+        # Registered commands by the id Discord assigned to them.
+        # This is filled in when the id is learned from a sync or fetch.
+        self._interactions_by_id: dict[int, decorator_command_types] = dict()
+
+        # Routing table of (guild id, application type, name, subcommand group, subcommand)
+        # to (top-level command, invoked function). The guild id of global commands is None.
+        self._routes: dict[
+            tuple[int | None, int, str, str | None, str | None],
+            tuple[decorator_command_types, decorator_command_types | SubCommand],
+        ] = dict()
+
         self._detect_components: dict[str, list[DetectComponent]] = dict()
+        # Detect components with a template or prefix custom_id, indexed by a trie.
+        self._detect_component_patterns: CustomIdRouter[DetectComponent] = (
+            CustomIdRouter()
+        )
 
         self.__sync_command_before_ready_register = []
         self.__sync_command_before_ready_popping = []
+        self.__sync_command_pending_guilds: dict[int, tuple[list, list]] = dict()
+
+        # Commands added or deleted after the bot is ready, synchronized in a batch.
+        self.__sync_command_register = []
+        self.__sync_command_popping = []
+        self.__sync_command_timer: asyncio.TimerHandle | None = None
+        self.__sync_command_lock = asyncio.Lock()
 
         self._checks: list[UserCheck] = []
 
-        self._deferred_components: dict[str, list] = dict()
-        self._deferred_global_components: list = list()
+        # Pending wait_for_component calls, indexed by custom_id, message id and user id.
+        self._component_waiters = WaiterRegistry()
+        # Open modal_stream calls, indexed by custom_id and user id.
+        self._modal_waiters = WaiterRegistry()
 
         self._multiple_setup_hook: list[CoroutineFunction] = list()
 
@@ -103,6 +199,8 @@ class ClientBase:
         self.interaction_http = InteractionHTTPClient(self.http)
 
         self.extra_events["on_ready"] = [self.on_ready]
+        self.extra_events["on_guild_join"] = [self._sync_pending_guild]
+        self.extra_events["on_guild_available"] = [self._sync_pending_guild]
 
     def dispatch(self, event_name: str, /, *args: Any, **kwargs: Any) -> None:
         # super() will resolve to Client
@@ -114,6 +212,11 @@ class ClientBase:
     async def on_ready(self):
         await self._sync_command_task()
 
+    async def close(self):
+        if self.sync_lock is not None:
+            await self.sync_lock.close()
+        await super().close()
+
     async def setup_hook(self):
         await super(ClientBase, self).setup_hook()
         for func in self._multiple_setup_hook:
@@ -129,20 +232,31 @@ class ClientBase:
         ----------
         command: ApplicationCommand
             Application Command to register with discord bot.
+            If ``guild_id`` of the command is set, it is registered to the guild.
         """
-        command_ids = await self._fetch_command_cached()
+        command_ids = await self._fetch_command_cached(command.guild_id)
         if command.name in command_ids[command.type.value - 1]:
             raise CommandRegistrationError(command.name)
 
-        return await self.http.upsert_global_command(
-            await self._application_id(), payload=command.to_register_dict()
+        data = await self.interaction_http.upsert_command(
+            await self._application_id(),
+            payload=command.to_register_dict(),
+            guild_id=command.guild_id,
         )
+        self._set_command_id(
+            command.type.value,
+            command.name,
+            data["id"],
+            data.get("version"),
+            guild_id=command.guild_id,
+        )
+        return data
 
     async def _find_command(
         self, command: ApplicationCommand, command_id: int
     ) -> int | None:
-        if command_id is None and command.id is None:
-            command_ids = await self._fetch_command_cached()
+        if command_id is None and not command.id:
+            command_ids = await self._fetch_command_cached(command.guild_id)
             if command.name not in command_ids[command.type.value - 1]:
                 raise CommandNotFound(f'Command "{command.name}" is not found')
 
@@ -162,10 +276,11 @@ class ClientBase:
             Edit application command's id
         """
         command_id = await self._find_command(command, command_id)
-        return await self.http.edit_global_command(
+        return await self.interaction_http.edit_command(
             await self._application_id(),
             command_id=command_id or command.id,
             payload=command.to_register_dict(),
+            guild_id=command.guild_id,
         )
 
     async def delete_command(self, command: ApplicationCommand, command_id: int = None):
@@ -179,8 +294,10 @@ class ClientBase:
             Delete application command's id
         """
         command_id = await self._find_command(command, command_id)
-        return await self.http.delete_global_command(
-            await self._application_id(), command_id=command_id or command.id
+        return await self.interaction_http.delete_command(
+            await self._application_id(),
+            command_id=command_id or command.id,
+            guild_id=command.guild_id,
         )
 
     # Listener
@@ -279,18 +396,46 @@ class ClientBase:
             self._application_id_value = application_info.id
         return self._application_id_value
 
-    async def fetch_commands(self) -> list[dict[str, command_types]]:
-        """Fetch and update all application commands registered in discord to discord bot."""
-        data = await self.http.get_global_commands(await self._application_id())
+    async def fetch_commands(
+        self, guild_id: int | None = None
+    ) -> list[dict[str, command_types]]:
+        """Fetch and update all application commands registered in discord to discord bot.
+
+        Parameters
+        ----------
+        guild_id : Optional[int]
+            The guild id to fetch guild commands of. Global commands are fetched by default.
+        """
+        data = await self.interaction_http.get_commands(
+            await self._application_id(), guild_id=guild_id
+        )
+        return self._set_fetch_commands(data, guild_id)
+
+    def _set_fetch_commands(
+        self, data: list[dict], guild_id: int | None = None
+    ) -> list[dict[str, command_types]]:
         result = [{}, {}, {}]  # list order: [
         #     ApplicationCommandType.CHAT_INPUT,
         #     ApplicationCommandType.USER,
         #     ApplicationCommandType.MESSAGE
         # ]
+        if guild_id is None:
+            previous = self._fetch_interactions
+            self._fetch_interactions = result
+        else:
+            previous = self._fetch_guild_interactions.get(guild_id)
+            self._fetch_guild_interactions[guild_id] = result
+        for previous_commands in previous or []:
+            for _x in previous_commands.values():
+                self._fetch_interactions_by_id.pop(int(_x.id), None)
+
         for x in data:
             _x = from_payload(x)
             result[_x.type.value - 1][_x.name] = _x
-        self._fetch_interactions = result
+            self._fetch_interactions_by_id[int(_x.id)] = _x
+            self._set_command_id(
+                _x.type.value, _x.name, _x.id, _x.version, guild_id=guild_id
+            )
         return result
 
     async def fetch_command(
@@ -298,6 +443,7 @@ class ClientBase:
         command_id: int,
         use_cached: bool = False,
         command_type: ApplicationCommandType = None,
+        guild_id: int | None = None,
     ) -> command_types:
         """Fetches and updates the application commands specified in the discord to the client.
 
@@ -310,6 +456,8 @@ class ClientBase:
             If application command list is not found in preloaded list, it is automatically updated.
         command_type : Optional[ApplicationCommandType]
             Application Command Type. Default value is ``CHAT_INPUT``
+        guild_id : Optional[int]
+            The guild id of guild command. Global commands are fetched by default.
 
         Returns
         -------
@@ -319,46 +467,62 @@ class ClientBase:
             command_type = ApplicationCommandType.CHAT_INPUT
 
         if use_cached:
-            cached_command_list = await self._fetch_command_cached()
-            if command_id in cached_command_list[command_type.value - 1].keys():
-                return cached_command_list[command_type.value - 1][command_id]
-        data = await self.http.get_global_command(
-            application_id=await self._application_id(), command_id=command_id
+            fetch_data = await self._fetch_command_cached(guild_id)
+            cached_command = self._fetch_interactions_by_id.get(int(command_id))
+            if cached_command is not None:
+                return cached_command
+        data = await self.interaction_http.get_command(
+            await self._application_id(), command_id=command_id, guild_id=guild_id
         )
         _result = from_payload(data)
-        if (
-            use_cached
-            and command_id
-            not in self._fetch_interactions[command_type.value - 1].keys()
-        ):
-            self._fetch_interactions[command_type.value - 1][_result.name] = _result
+        if use_cached:
+            fetch_data[_result.type.value - 1][_result.name] = _result
+            self._fetch_interactions_by_id[int(_result.id)] = _result
+        self._set_command_id(
+            _result.type.value,
+            _result.name,
+            _result.id,
+            _result.version,
+            guild_id=guild_id,
+        )
         return _result
 
-    async def _fetch_command_cached(self) -> list[dict[str, ApplicationCommand]]:
-        if self._fetch_interactions is None:
-            await self.fetch_commands()
-        return self._fetch_interactions
-
-    async def _sync_command(self, command: command_types):
-        await self.wait_until_ready()
-        fetch_data = await self._fetch_command_cached()
-        if command.name in fetch_data[command.type.value - 1].keys():
-            command_id = fetch_data[command.type.value - 1][command.name].id
-            if command.name in self._interactions[command.type.value - 1]:
-                self._interactions[command.type.value - 1][command.name].id = command_id
-            if fetch_data[command.type.value - 1][command.name] != command:
-                await self.edit_command(command=command)
+    async def _fetch_command_cached(
+        self, guild_id: int | None = None
+    ) -> list[dict[str, ApplicationCommand]]:
+        if guild_id is None:
+            if self._fetch_interactions is None:
+                await self.fetch_commands()
+            return self._fetch_interactions
+
+        if guild_id not in self._fetch_guild_interactions:
+            await self.fetch_commands(guild_id)
+        return self._fetch_guild_interactions[guild_id]
+
+    def _set_command_id(
+        self,
+        command_type: int,
+        name: str,
+        command_id: int | str,
+        version: int | str | None = None,
+        guild_id: int | None = None,
+    ):
+        if guild_id is None:
+            interactions = self._interactions
         else:
-            await self.register_command(command)
-        return
+            interactions = self._guild_interactions.get(guild_id)
+        if interactions is None:
+            return
+        command = interactions[command_type - 1].get(name)
+        if command is None:
+            return
 
-    async def _sync_command_popping(self, command: command_types):
-        await self.wait_until_ready()
-        fetch_data = await self._fetch_command_cached()
-        if command.name in fetch_data[command.type.value - 1].keys():
-            command_id = fetch_data[command.type.value - 1][command.name].id
-            await self.delete_command(command, command_id=command_id)
-        return
+        if command.id and self._interactions_by_id.get(int(command.id)) is command:
+            self._interactions_by_id.pop(int(command.id))
+        command.id = int(command_id)
+        if version is not None:
+            command.version = int(version)
+        self._interactions_by_id[command.id] = command
 
     def _load_from_module_spec(
         self, spec: importlib.machinery.ModuleSpec, key: str, **kwargs
@@ -455,31 +619,421 @@ class ClientBase:
             self.load_extension(cog, **kwargs)
         return
 
+    def _is_registered(self, command: decorator_command_types) -> bool:
+        interactions = self._get_interactions(command.guild_id)
+        return interactions[command.type.value - 1].get(command.name) is command
+
+    def _is_guild_available(self, guild_id: int) -> bool:
+        if not self.intents.guilds:
+            # Guilds are never cached, so their commands are synchronized immediately.
+            return True
+        return self.get_guild(guild_id) is not None
+
+    async def _bulk_sync_command(
+        self,
+        register: list[command_types],
+        popping: list[command_types],
+        guild_id: int | None,
+        semaphore: asyncio.Semaphore,
+        cleanup: bool = True,
+    ) -> list[dict[str, command_types]]:
+        async with semaphore:
+            fetch_data = await self._fetch_command_cached(guild_id)
+        interactions = self._get_interactions(guild_id)
+        synced = set()
+        payload = []
+        for command in popping:
+            synced.add((command.type.value, command.name))
+
+        for command in register:
+            synced.add((command.type.value, command.name))
+            payload.append(command.to_register_dict())
+
+        # Remote commands not handled by this sync are kept as they are.
+        # The fetched payload is sent back, so fields not modeled by the commands
+        # (e.g. integration_types, contexts, nsfw, localizations) are not reset.
+        for index in range(3):
+            for name, fetched in fetch_data[index].items():
+                if (index + 1, name) in synced:
+                    continue
+                if cleanup and name not in interactions[index]:
+                    continue
+                if fetched._raw_payload is not None:
+                    payload.append(fetched._raw_payload)
+                else:
+                    payload.append(fetched.to_register_dict())
+
+        scope = "" if guild_id is None else f" of guild {guild_id}"
+        diff = diff_commands(
+            payload, [x for index in range(3) for x in fetch_data[index].values()]
+        )
+        if not diff:
+            log.info(
+                f"Application commands{scope} are not changed. Skip overwriting commands."
+            )
+            return fetch_data
+
+        log.info(f"Overwrite application commands{scope}. {diff.report()}")
+        async with semaphore:
+            data = await self.interaction_http.bulk_upsert_commands(
+                await self._application_id(), payload=payload, guild_id=guild_id
+            )
+        return self._set_fetch_commands(data, guild_id)
+
+    def _sync_fingerprint(self) -> str:
+        register = [
+            command
+            for command in self.__sync_command_before_ready_register
+            if self._is_registered(command)
+        ]
+        popping = sorted(
+            (command.guild_id or 0, command.type.value, command.name)
+            for command in self.__sync_command_before_ready_popping
+        )
+        return get_fingerprint(
+            {
+                "commands": get_manifest(register),
+                "delete": popping,
+                "global_sync_command": self.global_sync_command,
+            }
+        )
+
+    def _load_sync_state(self, fingerprint: str) -> bool:
+        state = load_sync_state(self.sync_state_path)
+        if state is None or state["fingerprint"] != fingerprint:
+            return False
+
+        self._set_command_ids(state.get("commands", []))
+        return True
+
+    def _set_command_ids(self, commands: list[dict]):
+        for command in commands:
+            guild_id = command.get("guild_id")
+            self._set_command_id(
+                command["type"],
+                command["name"],
+                command["id"],
+                command.get("version"),
+                guild_id=None if guild_id is None else int(guild_id),
+            )
+
+    def _save_sync_state(self, fingerprint: str, commands: list[command_types]):
+        synced = []
+        for command in commands:
+            if not self._is_registered(command):
+                continue
+            if not command.id:
+                # The id of the command is unknown, so the state can't be reused.
+                return
+            synced.append(command)
+        save_sync_state(self.sync_state_path, fingerprint, synced)
+
     async def _sync_command_task(self):
-        if len(self.__sync_command_before_ready_register) != 0:
+        if self.sync_lock is None:
+            await self._sync_command_startup()
+            return
+
+        self._sync_leader = await self.sync_lock.acquire()
+        if not self._sync_leader:
+            await self._wait_sync_leader()
+            return
+
+        published = False
+        try:
+            await self._sync_command_startup()
+            await self.sync_lock.publish(
+                get_command_ids(
+                    [command for command in self.get_interaction() if command.id]
+                )
+            )
+            published = True
+        finally:
+            if not published:
+                # The other processes fall back to fetching the command ids.
+                await self.sync_lock.abort()
+
+    async def _wait_sync_leader(self):
+        log.info(
+            "Another process synchronizes application commands. Wait for the command ids."
+        )
+        register = self.__sync_command_before_ready_register
+        self.__sync_command_before_ready_register = []
+        self.__sync_command_before_ready_popping = []
+        try:
+            commands = await self.sync_lock.wait()
+        except (asyncio.TimeoutError, OSError) as error:
+            # ConnectionError is a subclass of OSError.
+            log.warning(
+                f"Failed to receive the command ids ({error!r}). Fetch application commands."
+            )
+            await self._fetch_command_ids(register)
+            return
+        self._set_command_ids(commands)
+
+    async def _fetch_command_ids(self, commands: list[command_types]):
+        scopes = dict.fromkeys(command.guild_id for command in commands)
+        await asyncio.gather(*[self.fetch_commands(guild_id) for guild_id in scopes])
+
+    async def _sync_command_startup(self):
+        if self.sync_state_path is None:
+            await self._sync_command_queue()
+            return
+
+        fingerprint = self._sync_fingerprint()
+        if self._load_sync_state(fingerprint):
             log.info(
-                f"Register registered commands before bot is ready. List: "
-                f"{', '.join([x.name for x in self.__sync_command_before_ready_register])}"
+                "Application commands are not changed. Skip synchronizing commands."
+            )
+            self.__sync_command_before_ready_register = []
+            self.__sync_command_before_ready_popping = []
+            return
+
+        commands = list(self.__sync_command_before_ready_register)
+        reports = await self._sync_command_queue()
+        if any(len(x.failed) != 0 or len(x.skipped) != 0 for x in reports):
+            # The remote commands differ from the fingerprint, so they are synchronized again next time.
+            log.warning(
+                "Some application commands failed to synchronize. Remove the sync state."
             )
-        while len(self.__sync_command_before_ready_register) != 0:
-            command = self.__sync_command_before_ready_register.pop()
-            await self._sync_command(command=command)
-        while len(self.__sync_command_before_ready_popping) != 0:
-            command = self.__sync_command_before_ready_popping.pop()
-            await self._sync_command_popping(command=command)
-
-        if self.global_sync_command:
+            delete_sync_state(self.sync_state_path)
+            return
+        self._save_sync_state(fingerprint, commands)
+
+    async def _sync_command_queue(self) -> list[SyncReport]:
+        register = self.__sync_command_before_ready_register
+        popping = self.__sync_command_before_ready_popping
+        self.__sync_command_before_ready_register = []
+        self.__sync_command_before_ready_popping = []
+        async with self.__sync_command_lock:
+            return await self._sync_commands(register, popping, cleanup=True)
+
+    def _schedule_sync_command(
+        self, register: command_types = None, popping: command_types = None
+    ):
+        if register is not None:
+            self.__sync_command_register.append(register)
+        if popping is not None:
+            self.__sync_command_popping.append(popping)
+
+        # Changes made within sync_command_delay seconds are synchronized together.
+        if self.__sync_command_timer is not None:
+            self.__sync_command_timer.cancel()
+        self.__sync_command_timer = self.loop.call_later(
+            self.sync_command_delay, self._flush_sync_command
+        )
+
+    def _flush_sync_command(self):
+        self.__sync_command_timer = None
+        self._schedule_event(self._sync_command_batch, "sync_command")
+
+    async def _sync_command_batch(self):
+        async with self.__sync_command_lock:
+            register = self.__sync_command_register
+            popping = self.__sync_command_popping
+            self.__sync_command_register = []
+            self.__sync_command_popping = []
+            if self._sync_leader is False:
+                # Only the ids are loaded, the leader process synchronizes commands.
+                await self._fetch_command_ids(register)
+                return
+            await self._sync_commands(register, popping, cleanup=False)
+
+    async def _sync_commands(
+        self,
+        register: list[command_types],
+        popping: list[command_types],
+        cleanup: bool,
+    ) -> list[SyncReport]:
+        """Synchronizes the commands of each scope.
+
+        Returns
+        -------
+            The reports of the scopes whose changes were applied one by one.
+        """
+        register = [command for command in register if self._is_registered(command)]
+
+        # Commands to register and delete in each scope. ``None`` is the global scope.
+        scopes: dict[int | None, tuple[list, list]] = dict()
+        for command in register:
+            scopes.setdefault(command.guild_id, ([], []))[0].append(command)
+        for command in popping:
+            scopes.setdefault(command.guild_id, ([], []))[1].append(command)
+        cleanup = cleanup and self.global_sync_command
+        if cleanup:
+            scopes.setdefault(None, ([], []))
+        if len(scopes) == 0:
+            return []
+
+        if len(register) != 0:
+            log.info(
+                f"Register registered commands. List: "
+                f"{', '.join([x.name for x in register])}"
+            )
+        if cleanup:
             log.info(
                 "global_sync_command is activated. Delete unregistered commands on client."
             )
-            popping_data = await self._fetch_command_cached()
-            for index in range(3):
-                for already_cmd in self._interactions[index]:
-                    if already_cmd in popping_data[index]:
-                        del popping_data[index][already_cmd]
 
-                for cmd in popping_data[index].values():
-                    await self.delete_command(cmd)
+        for guild_id in [x for x in scopes.keys() if x is not None]:
+            if self._is_guild_available(guild_id):
+                continue
+            # Commands of a guild the bot is not in are synchronized when it joins.
+            pending_register, pending_popping = (
+                self.__sync_command_pending_guilds.setdefault(guild_id, ([], []))
+            )
+            pending_register += scopes[guild_id][0]
+            pending_popping += scopes[guild_id][1]
+            scopes.pop(guild_id)
+
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+        reports = await asyncio.gather(
+            *[
+                self._sync_scope(
+                    guild_id, scope_register, scope_popping, semaphore, cleanup
+                )
+                for guild_id, (scope_register, scope_popping) in scopes.items()
+            ]
+        )
+        return [report for report in reports if report is not None]
+
+    async def _sync_scope(
+        self,
+        guild_id: int | None,
+        register: list[command_types],
+        popping: list[command_types],
+        semaphore: asyncio.Semaphore,
+        cleanup: bool = True,
+    ) -> SyncReport | None:
+        """Synchronizes the commands of a scope.
+
+        Returns
+        -------
+            The report of the applied changes, or ``None`` if nothing was changed
+            or the commands were overwritten in bulk, which raises on failure.
+        """
+        if self.bulk_sync_command:
+            await self._bulk_sync_command(
+                register, popping, guild_id, semaphore, cleanup
+            )
+            return
+
+        async with semaphore:
+            fetch_data = await self._fetch_command_cached(guild_id)
+        interactions = self._get_interactions(guild_id)
+        registered = {(command.type.value, command.name) for command in register}
+        deleted = {(command.type.value, command.name) for command in popping}
+        remote = []
+        for index in range(3):
+            for name, fetched in fetch_data[index].items():
+                key = (index + 1, name)
+                if (
+                    key in registered
+                    or key in deleted
+                    or (cleanup and name not in interactions[index])
+                ):
+                    remote.append(fetched)
+
+        diff = diff_commands(register, remote)
+        if not diff:
+            return
+
+        scope = "" if guild_id is None else f" of guild {guild_id}"
+        log.info(f"Synchronize application commands{scope}. {diff.report()}")
+        report = await self._apply_command_changes(diff.changes, guild_id, semaphore)
+        log.info(report.summary())
+        self.dispatch("command_sync", report)
+        return report
+
+    async def _sync_pending_guild(self, guild: discord.Guild):
+        pending = self.__sync_command_pending_guilds.pop(guild.id, None)
+        if pending is None:
+            return
+
+        register, popping = pending
+        register = [command for command in register if self._is_registered(command)]
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+        async with self.__sync_command_lock:
+            await self._sync_scope(
+                guild.id, register, popping, semaphore, self.global_sync_command
+            )
+
+    async def _apply_command_changes(
+        self,
+        changes: list[CommandChange],
+        guild_id: int | None,
+        semaphore: asyncio.Semaphore,
+    ) -> SyncReport:
+        application_id = await self._application_id()
+        quota = self._command_create_quotas.get(guild_id)
+        if quota is None:
+            quota = self._command_create_quotas[guild_id] = CommandCreateQuota()
+
+        async def apply(change: CommandChange) -> SyncOperation:
+            if change.action == "create" and not quota.acquire():
+                return SyncOperation(change, "skipped", 0.0)
+
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    data = None
+                    if change.action == "create":
+                        data = await self.interaction_http.upsert_command(
+                            application_id, payload=change.payload, guild_id=guild_id
+                        )
+                    elif change.action == "patch":
+                        data = await self.interaction_http.edit_command(
+                            application_id,
+                            command_id=change.id,
+                            payload=change.payload,
+                            guild_id=guild_id,
+                        )
+                    else:
+                        await self.interaction_http.delete_command(
+                            application_id, command_id=change.id, guild_id=guild_id
+                        )
+                except discord.RateLimited as error:
+                    # The rate limit is longer than max_ratelimit_timeout of the client.
+                    return SyncOperation(
+                        change, "failed", time.perf_counter() - started, error
+                    )
+                except discord.HTTPException as error:
+                    if error.code == 30034:
+                        # Max number of daily application command creates has been reached.
+                        quota.exhaust()
+                    return SyncOperation(
+                        change, "failed", time.perf_counter() - started, error
+                    )
+                self._set_fetch_command(change, data, guild_id)
+                return SyncOperation(change, "success", time.perf_counter() - started)
+
+        report = SyncReport(guild_id)
+        started = time.perf_counter()
+        report.operations = list(
+            await asyncio.gather(*[apply(change) for change in changes])
+        )
+        report.duration = time.perf_counter() - started
+        return report
+
+    def _set_fetch_command(
+        self, change: CommandChange, data: dict | None, guild_id: int | None
+    ):
+        if guild_id is None:
+            fetch_data = self._fetch_interactions
+        else:
+            fetch_data = self._fetch_guild_interactions[guild_id]
+
+        if data is None:
+            fetched = fetch_data[change.type - 1].pop(change.name, None)
+            if fetched is not None:
+                self._fetch_interactions_by_id.pop(int(fetched.id), None)
+            return
+
+        fetched = from_payload(data)
+        fetch_data[change.type - 1][fetched.name] = fetched
+        self._fetch_interactions_by_id[int(fetched.id)] = fetched
+        self._set_command_id(
+            change.type, fetched.name, fetched.id, fetched.version, guild_id=guild_id
+        )
 
     def add_detect_component(self, detect_component: DetectComponent, _parent=None):
         """Register for the detect_component event.
@@ -491,6 +1045,8 @@ class ClientBase:
         ----------
         detect_component: DetectComponent
             Coroutine functions that are called when a button is pressed or a selection is made.
+            If it has a template or prefix custom_id,
+            it is called for every custom_id matching it.
         _parent
             These parameters is used for cog.
         """
@@ -498,15 +1054,32 @@ class ClientBase:
         if _parent is not None:
             detect_component.cog = _parent
 
-        if name in self._detect_components:
+        if detect_component.custom_id_pattern is not None:
+            self._detect_component_patterns.add(
+                detect_component.custom_id_pattern, detect_component
+            )
+        elif name in self._detect_components:
             self._detect_components[name].append(detect_component)
         else:
             self._detect_components[name] = [detect_component]
         return
 
-    def get_detect_component(self):
-        """Get all of detect_components"""
-        return self._detect_components
+    def get_detect_component(self) -> dict[str, list[DetectComponent]]:
+        """Get all of detect_components
+
+        Detect components with a template or prefix custom_id are keyed by the template.
+        """
+        result = {
+            custom_id: list(detect_components)
+            for custom_id, detect_components in self._detect_components.items()
+        }
+        # A template may be the same text as an exact custom_id, so the lists are merged.
+        for (
+            custom_id,
+            detect_components,
+        ) in self._detect_component_patterns.values().items():
+            result.setdefault(custom_id, []).extend(detect_components)
+        return result
 
     def remove_detect_component(
         self, custom_id: str, detect_component: DetectComponent = None
@@ -524,7 +1097,11 @@ class ClientBase:
             If detect_component is None, delete all detect_components corresponding to custom_id.
         """
         if detect_component is None:
-            self._detect_components.pop(custom_id)
+            removed = self._detect_component_patterns.remove(custom_id)
+            if custom_id in self._detect_components or len(removed) == 0:
+                self._detect_components.pop(custom_id)
+        elif detect_component.custom_id_pattern is not None:
+            self._detect_component_patterns.remove(custom_id, detect_component)
         else:
             for i, x in enumerate(self._detect_components[custom_id]):
                 if x == detect_component:
@@ -545,6 +1122,7 @@ class ClientBase:
         ----------
         command : Union[Command, MemberCommand, ContextMenuCommand]
             Application commands to register
+            If ``guild_id`` of the command is set, it is registered as a command of the guild.
         sync_command : Optional[bool]
             It synchronizes with Discord.
             If it's not in the Discord application command list,
@@ -560,11 +1138,13 @@ class ClientBase:
         --------
             If a command synchronization request is made before the Discord Bot is ready,
             it will wait and synchronize the command when it is ready.
+            Guild commands of a guild the bot is not in are synchronized when the bot joins it.
         """
         if sync_command is None:
             sync_command = self.global_sync_command
 
-        if command.name in self._interactions[command.type.value - 1]:
+        interactions = self._get_interactions(command.guild_id)
+        if command.name in interactions[command.type.value - 1]:
             raise CommandRegistrationError(command.name)
 
         if _parent is not None:
@@ -572,29 +1152,89 @@ class ClientBase:
 
             # Add cog to subcommand in command's option.
             if getattr(command, "is_subcommand", False):
-                for index, sub_command in enumerate(command.options):
+                for sub_command in command.options:
                     if not isinstance(sub_command, (SubCommand, SubCommandGroup)):
                         continue
-                    command.options[index].cog = command.cog
+                    sub_command.cog = command.cog
+                for sub_command in command.subcommands.values():
+                    sub_command.cog = command.cog
 
         if command.type == ApplicationCommandType.CHAT_INPUT:
             command.set_signature_option()
-        self._interactions[command.type.value - 1][command.name] = command
+        interactions[command.type.value - 1][command.name] = command
+        self._add_routes(command)
+        if command.id:
+            self._interactions_by_id[int(command.id)] = command
 
         if sync_command:
             if self.is_ready():
-                self._schedule_event(
-                    self._sync_command, "sync_command", command=command
-                )
+                self._schedule_sync_command(register=command)
             else:
                 self.__sync_command_before_ready_register.append(command)
         return
 
+    def _get_interactions(
+        self, guild_id: int | None = None
+    ) -> list[dict[str, decorator_command_types]]:
+        if guild_id is None:
+            return self._interactions
+        if guild_id not in self._guild_interactions:
+            self._guild_interactions[guild_id] = [dict(), dict(), dict()]
+        return self._guild_interactions[guild_id]
+
+    def _has_interactions(self, application_type: int, guild_id: int | None) -> bool:
+        """Whether a global command or a command of the guild has the application type."""
+        if len(self._interactions[application_type - 1]) != 0:
+            return True
+        interactions = self._guild_interactions.get(guild_id)
+        return interactions is not None and len(interactions[application_type - 1]) != 0
+
+    def _add_routes(self, command: decorator_command_types):
+        prefix = (command.guild_id, command.type.value, command.name)
+        self._routes[(*prefix, None, None)] = (command, command)
+        for (group_name, name), sub_command in getattr(
+            command, "subcommands", {}
+        ).items():
+            self._routes[(*prefix, group_name, name)] = (command, sub_command)
+
+    def _remove_routes(self, command: decorator_command_types):
+        prefix = (command.guild_id, command.type.value, command.name)
+        for key in [key for key in self._routes.keys() if key[:3] == prefix]:
+            self._routes.pop(key)
+
+    def _get_route(
+        self, key: tuple[int | None, int, str, str | None, str | None]
+    ) -> tuple[decorator_command_types, decorator_command_types | SubCommand] | None:
+        route = self._routes.get(key)
+        if route is None and key[3:] != (None, None):
+            # A subcommand may have been attached after the command was added.
+            top_route = self._routes.get((*key[:3], None, None))
+            if top_route is not None:
+                self._add_routes(top_route[0])
+                route = self._routes.get(key)
+        return route
+
+    @staticmethod
+    def _get_command_route(
+        command: decorator_command_types,
+        group_name: str | None,
+        sub_command_name: str | None,
+    ) -> tuple[decorator_command_types, decorator_command_types | SubCommand] | None:
+        if group_name is None and sub_command_name is None:
+            return command, command
+        sub_command = command.subcommands.get((group_name, sub_command_name))
+        if sub_command is None:
+            return
+        return command, sub_command
+
     def get_interaction(self):
         """Get all interaction command included Application Command, User Command and Context Menu Command"""
         result = []
         for x in self._interactions:
             result += x.values()
+        for interactions in self._guild_interactions.values():
+            for x in interactions:
+                result += x.values()
         return result
 
     def delete_interaction(self, command: command_types, sync_command: bool = None):
@@ -625,16 +1265,18 @@ class ClientBase:
         if sync_command is None:
             sync_command = self.global_sync_command
 
-        if command.name not in self._interactions[command.type.value - 1]:
+        interactions = self._get_interactions(command.guild_id)
+        if command.name not in interactions[command.type.value - 1]:
             raise CommandNotFound(f'Command "{command.name}" is not found')
 
-        self._interactions[command.type.value - 1].pop(command.name)
+        interactions[command.type.value - 1].pop(command.name)
+        self._remove_routes(command)
+        if command.id and self._interactions_by_id.get(int(command.id)) is command:
+            self._interactions_by_id.pop(int(command.id))
 
         if sync_command:
             if self.is_ready():
-                self._schedule_event(
-                    self._sync_command_popping, "sync_command", command=command
-                )
+                self._schedule_sync_command(popping=command)
             else:
                 self.__sync_command_before_ready_popping.append(command)
 
@@ -700,7 +1342,7 @@ class ClientBase:
             state.dispatch("interaction_create", payload)
             if data.get("type") == 2:
                 result = ApplicationContext(data, self)
-                if len(self._interactions[result.application_type - 1]) != 0:
+                if self._has_interactions(result.application_type, result.guild_id):
                     state.dispatch("interaction_command", result)
             elif data.get("type") == 3:
                 result = ComponentsContext(data, self)
@@ -711,6 +1353,7 @@ class ClientBase:
                 state.dispatch("autocomplete", result)
             elif data.get("type") == 5:
                 result = ModalContext(data, self)
+                self._modal_waiters.dispatch(result)
                 state.dispatch("modal", result)
             return
         elif t == "MESSAGE_CREATE":
@@ -720,64 +1363,77 @@ class ClientBase:
             return
 
     # Application Context
-    async def process_interaction(self, ctx: ApplicationContext):
-        _state: ConnectionState = self._connection
-        command = self._interactions[ctx.application_type - 1].get(ctx.name)
-        if command is None:
-            return
+    @staticmethod
+    def _get_subcommand(options: dict, option_type: int) -> SubcommandContext | None:
+        for value in options.values():
+            if (
+                isinstance(value, SubcommandContext)
+                and value.option_type == option_type
+            ):
+                return value
+        return
+
+    def _resolve_route(self, ctx: ApplicationContext) -> tuple[
+        tuple[decorator_command_types, decorator_command_types | SubCommand] | None,
+        dict,
+    ]:
+        _option = {}
+        group_name = sub_command_name = None
+        if ctx.application_type == ApplicationCommandType.CHAT_INPUT.value:
+            _option = ctx.options
+            # Subcommands are told apart from the other options by their option type.
+            sub_command_group = self._get_subcommand(_option, 2)
+            if sub_command_group is not None:
+                group_name = sub_command_group.name
+                _option = sub_command_group.options
+            sub_command = self._get_subcommand(_option, 1)
+            if sub_command is not None:
+                sub_command_name = sub_command.name
+                _option = sub_command.options
+
+        command = self._interactions_by_id.get(ctx.command_id)
+        if command is not None:
+            return (
+                self._get_command_route(command, group_name, sub_command_name),
+                _option,
+            )
 
-        _state.dispatch("command", ctx)
+        route = None
+        key = (ctx.application_type, ctx.name, group_name, sub_command_name)
+        if ctx.guild_id is not None:
+            route = self._get_route((ctx.guild_id, *key))
+        if route is None:
+            route = self._get_route((None, *key))
+        return route, _option
 
+    async def process_interaction(self, ctx: ApplicationContext):
+        _state: ConnectionState = self._connection
         try:
-            func = ctx.function = command
-            if command.cog is not None:
-                ctx.parents = command.cog
-
-            if await self.can_run(ctx):
-                _option = {}
-                if ctx.application_type == ApplicationCommandType.CHAT_INPUT.value:
-                    _option = ctx.options
-                    is_subcommand = getattr(command, "is_subcommand", False)
-                    if is_subcommand:
-                        options = command.options
-                        if "subcommand_group" in ctx.options:
-                            sub_command_group = ctx.options["subcommand_group"]
-                            for opt in command.options:
-                                if (
-                                    isinstance(opt, SubCommandGroup)
-                                    and sub_command_group.name == opt.name
-                                ):
-                                    options = opt.options
-                                    break
-                        sub_command = ctx.options["subcommand"]
-                        for opt in options:
-                            if opt.name == sub_command.name and isinstance(
-                                opt, SubCommand
-                            ):
-                                ctx.function = func = opt
-                                ctx.parents = None
-                                if opt.cog is not None:
-                                    ctx.parents = opt.cog
-                                _option = sub_command.options
-                                break
-                if await func.can_run(ctx):
-                    if ctx.application_type == ApplicationCommandType.CHAT_INPUT.value:
-                        for f_opt in copy.copy(_option).keys():
-                            for opt in func.options:
-                                if opt.name == f_opt and opt.parameter_name != f_opt:
-                                    _option[opt.parameter_name] = _option.pop(f_opt)
-                                elif opt.name == f_opt:
-                                    break
-                        await func.callback(ctx, **_option)
-                    else:
-                        await func.callback(ctx)
-                else:
-                    raise CheckFailure("The check functions for command failed.")
+            route, _option = self._resolve_route(ctx)
+            if route is None:
+                return
+            command, func = route
+            _state.dispatch("command", ctx)
+
+            ctx.function = func
+            ctx.parents = func.cog
+
+            await self._can_run_all(ctx, func)
+            if ctx.application_type == ApplicationCommandType.CHAT_INPUT.value:
+                if func.binder is not None:
+                    _option = func.binder(_option)
+                async with self._acquire_concurrency(ctx, command, func):
+                    await update_cooldowns(ctx, *self._checks, *func.checks)
+                    await func.callback(ctx, **_option)
             else:
-                raise CheckFailure("The global check once functions failed.")
+                async with self._acquire_concurrency(ctx, command):
+                    await update_cooldowns(ctx, *self._checks, *func.checks)
+                    await func.callback(ctx)
         except Exception as error:
             if isinstance(error, CheckFailure):
                 _state.dispatch("command_permission_error", ctx, error)
+            elif isinstance(error, MaxConcurrencyReached):
+                _state.dispatch("max_concurrency_reached", ctx, error)
             _state.dispatch("interaction_command_error", ctx, error)
             raise error
         else:
@@ -790,52 +1446,50 @@ class ClientBase:
 
     # Components
     def wait_for_component(
-        self, custom_id: str, check=None, timeout=None
-    ) -> _Coroutine[ComponentsContext]:
+        self,
+        custom_id: str | None = None,
+        check=None,
+        timeout=None,
+        *,
+        message_id: int | None = None,
+        user_id: int | None = None,
+    ) -> asyncio.Future[ComponentsContext]:
         """Wait for the component with the specified custom_id to be sent.
 
-        The ``timeout`` parameter is passed to :func:`asyncio.wait_for()`.
         Note that by default it will not time out; if it does,
         it will propagate an :exc:`asyncio.TimeoutError`, which is provided for ease of use.
+        The waiter is removed as soon as it is resolved, cancelled or timed out.
 
         Parameters
         ----------
-        custom_id : str
+        custom_id : Optional[str]
             Custom ID for detect component
         check : Optional[Callable[..., bool]]
             A predicate to check what to wait for.
             The arguments must meet the parameters of the event being waited for.
         timeout : Optional[float]
             The number of seconds to wait before timing out and raising :exc:`asyncio.TimeoutError`.
+        message_id : Optional[int]
+            The id of the message the component must belong to.
+        user_id : Optional[int]
+            The id of the user who must use the component.
 
         Returns
         -------
             Returns a `ComponentsContext` that satisfies the custom_id.
         """
         future = self.loop.create_future()
-        if check is None:
-
-            def _check(_: ComponentsContext):
-                return True
-
-            check = _check
-
-        ev = custom_id.lower()
-        try:
-            listeners = self._deferred_components[ev]
-        except KeyError:
-            listeners = []
-            self._deferred_components[ev] = listeners
-
-        listeners.append((future, check, False))
-        return asyncio.wait_for(future, timeout)
+        waiter = ComponentWaiter(
+            future, check, custom_id=custom_id, message_id=message_id, user_id=user_id
+        )
+        self._component_waiters.add(waiter, timeout)
+        return future
 
     def wait_for_global_component(
         self, check=None, timeout=None
-    ) -> _Coroutine[ComponentsContext]:
+    ) -> asyncio.Future[ComponentsContext]:
         """Unconstrained by custom_id, waits for any component_id.
 
-        The ``timeout`` parameter is passed to :func:`asyncio.wait_for()`.
         Note that by default it will not time out; if it does,
         it will propagate an :exc:`asyncio.TimeoutError`, which is provided for ease of use.
 
@@ -851,90 +1505,173 @@ class ClientBase:
         -------
             Returns a :class:`ComponentContext` that satisfies the condition on `check`.
         """
-        future = self.loop.create_future()
-        if check is None:
+        return self.wait_for_component(check=check, timeout=timeout)
 
-            def _check(_: ComponentsContext):
-                return True
+    def component_stream(
+        self,
+        custom_id: str | None = None,
+        check=None,
+        idle_timeout: float | None = None,
+        *,
+        message_id: int | None = None,
+        user_id: int | None = None,
+        max_size: int = 100,
+    ) -> ComponentStream:
+        """Returns an asynchronous iterator over the components sent with the custom_id or message.
+
+        Unlike calling :meth:`wait_for_component` in a loop, the stream is registered once
+        and components sent between iterations are buffered.
+        It must be created while the event loop is running.
 
-            check = _check
+        Parameters
+        ----------
+        custom_id : Optional[str]
+            Custom ID for detect component
+        check : Optional[Callable[..., bool]]
+            A predicate to check what to iterate.
+        idle_timeout : Optional[float]
+            The number of seconds without a component before the iteration stops.
+        message_id : Optional[int]
+            The id of the message the component must belong to.
+        user_id : Optional[int]
+            The id of the user who must use the component.
+        max_size : int
+            The maximum number of components buffered. Components sent while it is full are ignored.
 
-        self._deferred_global_components.append((future, check, True))
-        return asyncio.wait_for(future, timeout)
+        Returns
+        -------
+            A :class:`ComponentStream` yielding :class:`ComponentsContext`.
+            Use it with ``async with`` to close it when the iteration is stopped early.
+        """
+        stream = ComponentStream(
+            check,
+            idle_timeout=idle_timeout,
+            max_size=max_size,
+            custom_id=custom_id,
+            message_id=message_id,
+            user_id=user_id,
+        )
+        self._component_waiters.add(stream)
+        return stream
+
+    def modal_stream(
+        self,
+        custom_id: str | None = None,
+        check=None,
+        idle_timeout: float | None = None,
+        *,
+        user_id: int | None = None,
+        max_size: int = 100,
+    ) -> ComponentStream:
+        """Returns an asynchronous iterator over the modals submitted with the custom_id.
+
+        Parameters
+        ----------
+        custom_id : Optional[str]
+            Custom ID of modal
+        check : Optional[Callable[..., bool]]
+            A predicate to check what to iterate.
+        idle_timeout : Optional[float]
+            The number of seconds without a submission before the iteration stops.
+        user_id : Optional[int]
+            The id of the user who must submit the modal.
+        max_size : int
+            The maximum number of submissions buffered.
+
+        Returns
+        -------
+            A :class:`ComponentStream` yielding :class:`ModalContext`.
+        """
+        stream = ComponentStream(
+            check,
+            idle_timeout=idle_timeout,
+            max_size=max_size,
+            custom_id=custom_id,
+            user_id=user_id,
+        )
+        self._modal_waiters.add(stream)
+        return stream
 
     async def can_run(self, ctx: ApplicationContext | ComponentsContext) -> bool:
         data = self._checks
         if len(data) == 0:
             return True
 
-        return await async_all(f(ctx) for f in data)  # type: ignore
+        if self.concurrent_checks:
+            return await async_all_concurrent(data, ctx, invoke=run_check)
+        return await async_all(run_check(f, ctx) for f in data)  # type: ignore
+
+    async def _can_run_all(
+        self,
+        ctx: ApplicationContext | ComponentsContext,
+        func: BaseCommand | SubCommand | DetectComponent,
+    ) -> bool:
+        async def global_check() -> bool:
+            if not await self.can_run(ctx):
+                raise CheckFailure("The global check once functions failed.")
+            return True
+
+        async def command_check() -> bool:
+            if await func.can_run(ctx):
+                return True
+            if isinstance(func, DetectComponent):
+                # A detect component whose checks fail is ignored.
+                return False
+            raise CheckFailure("The check functions for command failed.")
+
+        if self.concurrent_checks:
+            # Global checks and command checks are evaluated together.
+            return await async_all_concurrent((global_check, command_check))
+
+        return await global_check() and await command_check()
+
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def _acquire_concurrency(
+        ctx: ApplicationContext | ComponentsContext,
+        *funcs: BaseCommand | SubCommand | DetectComponent,
+    ):
+        async with contextlib.AsyncExitStack() as stack:
+            # The same function may be given twice (a command without subcommands).
+            for limiter in dict.fromkeys(func.max_concurrency for func in funcs):
+                if limiter is not None:
+                    await stack.enter_async_context(limiter.acquire(ctx))
+            yield
 
     async def process_components(self, component: ComponentsContext):
         _state: ConnectionState = self._connection
 
-        detect_component = self._detect_components.get(component.custom_id)
-        if detect_component is None:
-            detect_component = []
+        detect_component = [
+            (_component, {})
+            for _component in self._detect_components.get(component.custom_id, [])
+        ]
+        # Captured segments of template custom_ids are passed as keyword arguments.
+        detect_component += self._detect_component_patterns.match(component.custom_id)
         active_component = []
-        for _component in detect_component:
+        for _component, arguments in detect_component:
             if (
                 _component.type_id == component.component_type
                 or _component.type is None
             ):
                 try:
-                    if await self.can_run(component):
-                        if await _component.can_run(component):
-                            await _component.callback(component)
-                    else:
-                        raise CheckFailure("The global check once functions failed.")
+                    if await self._can_run_all(component, _component):
+                        async with self._acquire_concurrency(component, _component):
+                            await update_cooldowns(
+                                component, *self._checks, *_component.checks
+                            )
+                            await _component.callback(component, **arguments)
                 except Exception as error:
                     if isinstance(error, CheckFailure):
                         _state.dispatch("component_permission_error", component, error)
+                    elif isinstance(error, MaxConcurrencyReached):
+                        _state.dispatch("max_concurrency_reached", component, error)
                     _state.dispatch("component_error", component, error)
                 else:
                     _state.dispatch("component_complete", component)
                     active_component.append(component)
 
-        listeners = copy.copy(self._deferred_global_components)
-        listeners += copy.copy(self._deferred_components.get(component.custom_id, []))
-        detect_component_wait_for = []
-        if len(listeners) > 0:
-            removed = []
-            global_removed = []
-            for index, (future, check, global_component) in enumerate(listeners):
-                if future.cancelled():
-                    if global_component:
-                        global_removed.append(index)
-                    else:
-                        removed.append(index)
-                    continue
-
-                try:
-                    result = check(component)
-                except Exception as exc:
-                    future.set_exception(exc)
-                    if global_component:
-                        global_removed.append(index)
-                    else:
-                        removed.append(index)
-                else:
-                    if result:
-                        detect_component_wait_for.append(component)
-                        future.set_result(component)
-                        if global_component:
-                            global_removed.append(index)
-                        else:
-                            removed.append(index)
-
-            if len(removed) == len(listeners):
-                self._deferred_components.pop(component.custom_id)
-            else:
-                for idx in reversed(removed):
-                    self._deferred_components.get(component.custom_id, []).pop(idx)
-
-            for idx in reversed(global_removed):
-                self._deferred_global_components.pop(idx)
-        if len(detect_component_wait_for) == 0 and len(active_component) == 0:
+        detect_component_wait_for = self._component_waiters.dispatch(component)
+        if detect_component_wait_for == 0 and len(active_component) == 0:
             _state.dispatch("components_cancelled", component)
         return
 
@@ -22,6 +22,7 @@ SOFTWARE.
 """
 
 import logging
+from abc import *
 
 import discord
 
@@ -37,8 +38,85 @@ class Mentionable:
     pass
 
 
+class _CachedPayload(metaclass=ABCMeta):
+    """Memoizes the payload built by :meth:`_build_payload`.
+
+    The payload is built again when one of ``_payload_fields`` is assigned,
+    or when the payloads of the children from :meth:`_payload_children` have changed.
+    The payload is shared between calls, so it must not be modified.
+    """
+
+    _payload_fields: frozenset[str] = frozenset()
+
+    def __setattr__(self, key: str, value):
+        if key in self._payload_fields:
+            self.__dict__.pop("_payload", None)
+        super().__setattr__(key, value)
+
+    def _payload_children(self) -> list:
+        return []
+
+    @abstractmethod
+    def _build_payload(self, children: list[dict]) -> dict:
+        pass
+
+    def _get_payload(self) -> dict:
+        children = [child.to_dict() for child in self._payload_children()]
+        cached = self.__dict__.get("_payload")
+        if cached is not None:
+            cached_children, data = cached
+            if len(cached_children) == len(children) and all(
+                x is y for x, y in zip(cached_children, children)
+            ):
+                return data
+
+        data = self._build_payload(children)
+        self.__dict__["_payload"] = (children, data)
+        return data
+
+
+# The option type ids by the type of option, filled in on first use.
+_option_type_ids: dict[type, int] = dict()
+
+
+def get_option_type_id(option_type: type) -> int:
+    """Returns the id of an application command option type, e.g. 3 for ``str``."""
+    type_id = _option_type_ids.get(option_type)
+    if type_id is not None:
+        return type_id
+
+    if ApplicationSubcommand in option_type.__mro__:
+        type_id = 1
+    elif ApplicationSubcommandGroup in option_type.__mro__:
+        type_id = 2
+    elif str == option_type:
+        type_id = 3
+    elif int == option_type:
+        type_id = 4
+    elif bool == option_type:
+        type_id = 5
+    elif discord.User in option_type.__mro__:
+        type_id = 6
+    elif discord.abc.GuildChannel in option_type.__mro__:
+        type_id = 7
+    elif discord.Role in option_type.__mro__:
+        type_id = 8
+    elif Mentionable in option_type.__mro__:
+        type_id = 9
+    elif float == option_type:
+        type_id = 10
+    elif discord.Attachment == option_type:
+        type_id = 11
+    else:
+        raise TypeError(
+            "option type invalid (Subcommand and Subcommand Group, please use decorator)"
+        )
+    _option_type_ids[option_type] = type_id
+    return type_id
+
+
 # Option
-class CommandOptionChoice:
+class CommandOptionChoice(_CachedPayload):
     """Represents an application command option choice.
 
     Attributes
@@ -49,6 +127,8 @@ class CommandOptionChoice:
         The name of the choice. This is not visible to the user; max 100 characters.
     """
 
+    _payload_fields = frozenset({"name", "value"})
+
     def __init__(
         self,
         name: str,
@@ -61,9 +141,12 @@ class CommandOptionChoice:
     def from_payload(cls, data):
         return cls(name=data["name"], value=data["value"])
 
-    def to_dict(self) -> dict:
+    def _build_payload(self, children: list[dict]) -> dict:
         return {"name": self.name, "value": self.value}
 
+    def to_dict(self) -> dict:
+        return self._get_payload()
+
     def __eq__(self, other):
         return self.name == other.name and self.value == other.value
 
@@ -71,7 +154,7 @@ class CommandOptionChoice:
         return not self.__eq__(other)
 
 
-class CommandOption:
+class CommandOption(_CachedPayload):
     """Represents an application command option.
 
     Attributes
@@ -90,6 +173,20 @@ class CommandOption:
         Whether the option has autocomplete. (defaults to ``false``)
     """
 
+    _payload_fields = frozenset(
+        {
+            "_name",
+            "_type",
+            "description",
+            "choices",
+            "required",
+            "autocomplete",
+            "_channel_type",
+            "min_value",
+            "max_value",
+        }
+    )
+
     def __init__(
         self,
         name: str = None,
@@ -200,39 +297,18 @@ class CommandOption:
 
     @property
     def _get_type_id(self) -> int:
-        if ApplicationSubcommand in self.type.__mro__:
-            return 1
-        elif ApplicationSubcommandGroup in self.type.__mro__:
-            return 2
-        elif str == self.type:
-            return 3
-        elif int == self.type:
-            return 4
-        elif bool == self.type:
-            return 5
-        elif discord.User in self.type.__mro__:
-            return 6
-        elif discord.abc.GuildChannel in self.type.__mro__:
-            return 7
-        elif discord.Role in self.type.__mro__:
-            return 8
-        elif Mentionable in self.type.__mro__:
-            return 9
-        elif float == self.type:
-            return 10
-        elif discord.Attachment == self.type:
-            return 11
-        raise TypeError(
-            "option type invalid (Subcommand and Subcommand Group, please use decorator)"
-        )
+        return get_option_type_id(self.type)
 
-    def to_dict(self) -> dict:
+    def _payload_children(self) -> list[CommandOptionChoice]:
+        return self.choices
+
+    def _build_payload(self, children: list[dict]) -> dict:
         data = {
             "name": self.name,
             "description": self.description,
             "type": self._get_type_id,
             "required": self.required,
-            "choices": [choice.to_dict() for choice in self.choices],
+            "choices": children,
             "autocomplete": self.autocomplete,
         }
         if self._channel_type is not None:
@@ -243,6 +319,9 @@ class CommandOption:
             data["max_value"] = self.max_value
         return data
 
+    def to_dict(self) -> dict:
+        return self._get_payload()
+
     def __eq__(self, other):
         default_check = (
             self.name == other.name
@@ -312,7 +391,9 @@ class CommandOption:
         return new_cls
 
 
-class ApplicationSubcommand:
+class ApplicationSubcommand(_CachedPayload):
+    _payload_fields = frozenset({"name", "description", "options"})
+
     def __init__(
         self,
         name: str,
@@ -336,14 +417,20 @@ class ApplicationSubcommand:
             new_cls.options = [CommandOption.from_payload(x) for x in data["options"]]
         return new_cls
 
-    def to_dict(self) -> dict:
+    def _payload_children(self) -> list:
+        return self.options
+
+    def _build_payload(self, children: list[dict]) -> dict:
         return {
             "name": self.name,
             "description": self.description,
             "type": self._get_type_id,
-            "options": [opt.to_dict() for opt in self.options],
+            "options": children,
         }
 
+    def to_dict(self) -> dict:
+        return self._get_payload()
+
     def __eq__(self, other):
         default_check = (
             self.name == other.name
@@ -356,7 +443,9 @@ class ApplicationSubcommand:
         return not self.__eq__(other)
 
 
-class ApplicationSubcommandGroup:
+class ApplicationSubcommandGroup(_CachedPayload):
+    _payload_fields = frozenset({"name", "description", "options"})
+
     def __init__(
         self,
         name: str,
@@ -379,14 +468,20 @@ class ApplicationSubcommandGroup:
             options=[ApplicationSubcommand.from_payload(x) for x in data["options"]],
         )
 
-    def to_dict(self) -> dict:
+    def _payload_children(self) -> list:
+        return self.options
+
+    def _build_payload(self, children: list[dict]) -> dict:
         return {
             "name": self.name,
             "description": self.description,
             "type": self._get_type_id,
-            "options": [opt.to_dict() for opt in self.options],
+            "options": children,
         }
 
+    def to_dict(self) -> dict:
+        return self._get_payload()
+
     def __eq__(self, other):
         default_check = (
             self.name == other.name
@@ -399,7 +494,7 @@ class ApplicationSubcommandGroup:
         return not self.__eq__(other)
 
 
-class ApplicationCommand:
+class ApplicationCommand(_CachedPayload):
     """Represents an application command.
 
     Attributes
@@ -422,6 +517,10 @@ class ApplicationCommand:
         The default member permissions that can run this command
     """
 
+    _payload_fields = frozenset(
+        {"name", "type", "description", "default_member_permissions"}
+    )
+
     def __init__(
         self,
         name: str,
@@ -438,6 +537,8 @@ class ApplicationCommand:
         self.description: str | None = description
         self.default_member_permissions: str | None = default_member_permissions
         self.version: int = 1  # default: None
+        # The payload fetched from Discord, including the fields not modeled here.
+        self._raw_payload: dict | None = None
 
     @classmethod
     def from_payload(cls, data: dict):
@@ -453,9 +554,10 @@ class ApplicationCommand:
             setattr(new_cls, key, value)
         command_type = data["type"]
         new_cls.type = get_enum(ApplicationCommandType, command_type)
+        new_cls._raw_payload = data
         return new_cls
 
-    def to_register_dict(self) -> dict:
+    def _build_payload(self, children: list[dict]) -> dict:
         data = {
             "name": self.name,
             "type": self.type.value,
@@ -465,6 +567,14 @@ class ApplicationCommand:
             data["default_member_permissions"] = self.default_member_permissions
         return data
 
+    def to_register_dict(self) -> dict:
+        """Returns the payload to register the application command.
+
+        The payload is memoized until a field of the command or its options is changed,
+        so it must not be modified.
+        """
+        return self._get_payload()
+
     @property
     def is_guild(self) -> bool:
         """Whether a private command(guild command)"""
@@ -492,6 +602,8 @@ class SlashCommand(ApplicationCommand):
         A list of options for application command.
     """
 
+    _payload_fields = ApplicationCommand._payload_fields | {"options"}
+
     def __init__(
         self,
         options: list[
@@ -521,9 +633,12 @@ class SlashCommand(ApplicationCommand):
         ]
         return new_cls
 
-    def to_register_dict(self) -> dict:
-        data = super().to_register_dict()
-        data["options"] = [opt.to_dict() for opt in self.options]
+    def _payload_children(self) -> list:
+        return self.options
+
+    def _build_payload(self, children: list[dict]) -> dict:
+        data = super()._build_payload(children)
+        data["options"] = children
         return data
 
 
@@ -546,16 +661,16 @@ class ContextMenu(ApplicationCommand):
 command_types = SlashCommand | UserCommand | ContextMenu
 
 
+_command_classes: dict[int, type[ApplicationCommand]] = {
+    ApplicationCommandType.CHAT_INPUT: SlashCommand,
+    ApplicationCommandType.USER: UserCommand,
+    ApplicationCommandType.MESSAGE: ContextMenu,
+}
+
+
 def from_payload(data: dict) -> command_types:
-    if data["type"] == ApplicationCommandType.CHAT_INPUT:
-        _result = SlashCommand.from_payload(data)
-    elif data["type"] == ApplicationCommandType.USER:
-        _result = UserCommand.from_payload(data)
-    elif data["type"] == ApplicationCommandType.MESSAGE:
-        _result = ContextMenu.from_payload(data)
-    else:
-        _result = ApplicationCommand.from_payload(data)
-    return _result
+    cls = _command_classes.get(data["type"], ApplicationCommand)
+    return cls.from_payload(data)
 
 
 # For Decorator
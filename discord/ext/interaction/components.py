@@ -27,6 +27,7 @@ from typing import Any
 import discord
 
 from .core import BaseCore
+from .routing import CustomIdPattern
 from .utils import get_enum
 
 
@@ -466,8 +467,22 @@ def from_payload(
 # For Decorator
 class DetectComponent(BaseCore):
     def __init__(
-        self, func, custom_id, component_type: type[Components] = None, checks=None
+        self,
+        func,
+        custom_id: str | CustomIdPattern,
+        component_type: type[Components] = None,
+        checks=None,
+        prefix: bool = False,
+        pattern: bool = False,
     ):
+        # The compiled pattern when custom_id is a template or a prefix, otherwise None.
+        self.custom_id_pattern: CustomIdPattern | None = None
+        if isinstance(custom_id, CustomIdPattern):
+            self.custom_id_pattern = custom_id
+            custom_id = custom_id.pattern
+        elif prefix or pattern:
+            self.custom_id_pattern = CustomIdPattern(custom_id, prefix=prefix)
+
         self.custom_id = custom_id
         self.type = component_type
         self.func = func
@@ -482,9 +497,11 @@ class DetectComponent(BaseCore):
 
 def detect_component(
     cls: classmethod = None,
-    custom_id: str = None,
+    custom_id: str | CustomIdPattern = None,
     component_type: type[Components] = None,
     checks=None,
+    prefix: bool = False,
+    pattern: bool = False,
 ):
     """A decorator that transforms a function into a :class:`.DetectComponent`
 
@@ -493,11 +510,16 @@ def detect_component(
     cls
         The class to construct with.
         You usually don't change ``cls``.
-    custom_id: Optional[str]
+    custom_id: Optional[Union[str, CustomIdPattern]]
         The custom id for detect component.
     component_type: Type[Components]
         The component_type for detect component.
     checks
+    prefix: bool
+        Whether to detect every custom id starting with ``custom_id``.
+    pattern: bool
+        Whether ``custom_id`` is a template with segments, e.g. ``vote:{poll_id:int}:{choice}``.
+        The captured segments are passed to the function as keyword arguments.
     """
     if cls is None:
         cls = DetectComponent
@@ -515,6 +537,8 @@ def detect_component(
             custom_id=custom_id or _function.__name__,
             component_type=component_type,
             checks=checks,
+            prefix=prefix,
+            pattern=pattern,
         )
         return new_cls
 
@@ -0,0 +1,472 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from abc import *
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+
+from discord.ext.commands import (
+    BucketType,
+    Cooldown,
+    CommandOnCooldown,
+    MaxConcurrencyReached,
+)
+
+from .checks import check
+from .core import BaseCore
+from .interaction import InteractionContext, PartialMember
+
+
+def _refill(
+    bucket: tuple[float, float] | None, rate: int, per: float, current: float
+) -> float:
+    if bucket is None:
+        return float(rate)
+    tokens, updated_at = bucket
+    return min(float(rate), tokens + (current - updated_at) * rate / per)
+
+
+def _get_bucket_key(bucket_type: BucketType | Callable, ctx: InteractionContext) -> Any:
+    if bucket_type is BucketType.role and isinstance(ctx.author, PartialMember):
+        # Without the cache, the top role is unknown; the set of role ids is used instead.
+        return tuple(sorted(ctx.author._roles))
+    return bucket_type(ctx)
+
+
+class CooldownStorage(metaclass=ABCMeta):
+    """The storage backend of token buckets used by :func:`cooldown`.
+
+    A bucket is stored as the number of tokens left and the time it was last updated.
+    Each cooldown must have its own storage.
+    """
+
+    _take_lock: asyncio.Lock | None = None
+
+    @abstractmethod
+    async def get(self, key: str) -> tuple[float, float] | None:
+        """Returns ``(tokens, updated_at)`` of the bucket, or ``None`` if there is no bucket."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, tokens: float, updated_at: float):
+        """Stores the bucket."""
+        pass
+
+    @abstractmethod
+    async def sweep(self, before: float):
+        """Removes the buckets that were last updated before ``before``.
+        These buckets have been refilled, so they are the same as a missing bucket.
+        """
+        pass
+
+    async def take(
+        self, key: str, rate: int, per: float, current: float
+    ) -> float | None:
+        """Takes a token from the bucket, refilled at ``rate`` tokens per ``per`` seconds.
+
+        The bucket is read and written as one operation, so concurrent invocations
+        can't take the same token. The default implementation holds a lock around
+        :meth:`get` and :meth:`set`. Storages shared between processes should override it.
+
+        Returns
+        -------
+            The number of seconds to wait before retrying if the bucket is empty, otherwise ``None``.
+        """
+        if self._take_lock is None:
+            self._take_lock = asyncio.Lock()
+        async with self._take_lock:
+            tokens = _refill(await self.get(key), rate, per, current)
+            if tokens < 1:
+                return (1 - tokens) * per / rate
+            await self.set(key, tokens - 1, current)
+            return
+
+
+class MemoryCooldownStorage(CooldownStorage):
+    """Stores token buckets in memory.
+
+    Buckets are kept in the order they were updated,
+    so expired buckets are swept from the front without scanning the others.
+    """
+
+    def __init__(self):
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def get(self, key: str) -> tuple[float, float] | None:
+        return self._buckets.get(key)
+
+    async def set(self, key: str, tokens: float, updated_at: float):
+        self._buckets[key] = (tokens, updated_at)
+        self._buckets.move_to_end(key)
+
+    async def take(
+        self, key: str, rate: int, per: float, current: float
+    ) -> float | None:
+        # Nothing is awaited between reading and writing the bucket.
+        tokens = _refill(self._buckets.get(key), rate, per, current)
+        if tokens < 1:
+            return (1 - tokens) * per / rate
+        await self.set(key, tokens - 1, current)
+        return
+
+    async def sweep(self, before: float):
+        while len(self._buckets) > 0:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if updated_at >= before:
+                break
+            self._buckets.pop(key)
+
+
+class SQLiteCooldownStorage(CooldownStorage):
+    """Stores token buckets in a SQLite database.
+
+    Queries run in a dedicated thread, so they don't block the event loop.
+    Updates are committed at most once per ``commit_interval`` seconds and when the storage is closed,
+    so the updates of the last interval may be lost if the process stops.
+
+    Parameters
+    ----------
+    path: str
+        The path of the database file. This defaults to ``:memory:``
+    table: str
+        The name of the table. Cooldowns sharing a database file must use different tables.
+    commit_interval: float
+        The minimum seconds between commits. This defaults to 1 second.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        table: str = "cooldown",
+        commit_interval: float = 1.0,
+    ):
+        if not table.isidentifier():
+            raise ValueError("table must be a valid identifier.")
+        self.table = table
+        self.commit_interval = commit_interval
+        self._last_commit = time.monotonic()
+        # A single worker runs the queries in order on the connection.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_updated_at ON {table} (updated_at)"
+        )
+        self._connection.commit()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _commit(self, force: bool = False):
+        current = time.monotonic()
+        if force or current - self._last_commit >= self.commit_interval:
+            self._connection.commit()
+            self._last_commit = current
+
+    def _get(self, key: str) -> tuple[float, float] | None:
+        cursor = self._connection.execute(
+            f"SELECT tokens, updated_at FROM {self.table} WHERE key = ?", (key,)
+        )
+        return cursor.fetchone()
+
+    def _set(self, key: str, tokens: float, updated_at: float):
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, tokens, updated_at) VALUES (?, ?, ?)",
+            (key, tokens, updated_at),
+        )
+        self._commit()
+
+    def _take(self, key: str, rate: int, per: float, current: float) -> float | None:
+        if not self._connection.in_transaction:
+            # The bucket is locked for writing before it is read.
+            self._connection.execute("BEGIN IMMEDIATE")
+        tokens = _refill(self._get(key), rate, per, current)
+        if tokens < 1:
+            self._commit()
+            return (1 - tokens) * per / rate
+        self._set(key, tokens - 1, current)
+        return
+
+    def _sweep(self, before: float):
+        self._connection.execute(
+            f"DELETE FROM {self.table} WHERE updated_at < ?", (before,)
+        )
+        self._commit()
+
+    async def get(self, key: str) -> tuple[float, float] | None:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, tokens: float, updated_at: float):
+        await self._run(self._set, key, tokens, updated_at)
+
+    async def take(
+        self, key: str, rate: int, per: float, current: float
+    ) -> float | None:
+        # The bucket is read and written in a single call of the worker.
+        return await self._run(self._take, key, rate, per, current)
+
+    async def sweep(self, before: float):
+        await self._run(self._sweep, before)
+
+    def close(self):
+        """Commits the pending updates and closes the database."""
+        self._executor.shutdown(wait=True)
+        self._commit(force=True)
+        self._connection.close()
+
+
+class CooldownBucket:
+    """Token buckets of a cooldown, split by :class:`BucketType`.
+
+    Each bucket holds up to ``rate`` tokens and is refilled at ``rate`` tokens per ``per`` seconds.
+    An invocation takes a token from the bucket.
+
+    Attributes
+    ----------
+    cooldown: Cooldown
+        The rate and period of the cooldown.
+    type: Union[BucketType, Callable[[InteractionContext], Any]]
+        The type of bucket, or a function returning the key of bucket from the context.
+    storage: CooldownStorage
+        The storage of the buckets.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        per: float,
+        bucket_type: BucketType | Callable[[InteractionContext], Any] = BucketType.user,
+        storage: CooldownStorage = None,
+    ):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be greater than 0.")
+        if storage is None:
+            storage = MemoryCooldownStorage()
+        self.cooldown = Cooldown(rate, per)
+        self.type = bucket_type
+        self.storage = storage
+        self._last_sweep = time.time()
+
+    async def _sweep(self, current: float):
+        if current - self._last_sweep >= self.cooldown.per:
+            # Buckets not updated for ``per`` seconds are full again.
+            self._last_sweep = current
+            await self.storage.sweep(current - self.cooldown.per)
+
+    async def get_retry_after(
+        self, ctx: InteractionContext, current: float = None
+    ) -> float | None:
+        """Returns the number of seconds to wait if the bucket of the context is empty,
+        otherwise ``None``. No token is taken.
+        """
+        if current is None:
+            current = time.time()
+        await self._sweep(current)
+        rate, per = self.cooldown.rate, self.cooldown.per
+        bucket = await self.storage.get(str(_get_bucket_key(self.type, ctx)))
+        tokens = _refill(bucket, rate, per, current)
+        if tokens < 1:
+            return (1 - tokens) * self.cooldown.per / self.cooldown.rate
+        return
+
+    async def update_rate_limit(
+        self, ctx: InteractionContext, current: float = None
+    ) -> float | None:
+        """Takes a token from the bucket of the context.
+
+        Returns
+        -------
+            The number of seconds to wait before retrying if the bucket is empty, otherwise ``None``.
+        """
+        if current is None:
+            current = time.time()
+        await self._sweep(current)
+        return await self.storage.take(
+            str(_get_bucket_key(self.type, ctx)),
+            self.cooldown.rate,
+            self.cooldown.per,
+            current,
+        )
+
+
+def cooldown(
+    rate: int,
+    per: float,
+    bucket: BucketType | Callable[[InteractionContext], Any] = BucketType.user,
+    storage: CooldownStorage = None,
+) -> Callable:
+    """A decorator that adds a cooldown to a :class:`.Command`, :class:`.SubCommand`
+    or :class:`.DetectComponent`.
+
+    A cooldown allows a command to only be used ``rate`` times per ``per`` seconds
+    for each bucket given by ``bucket``.
+
+    If the cooldown is exceeded, :exc:`.CommandOnCooldown` is raised.
+    A token is only taken once all checks have passed, right before the invocation.
+
+    Parameters
+    ----------
+    rate: int
+        The number of times a command can be used before triggering a cooldown.
+    per: float
+        The amount of seconds to wait for a cooldown when it's been triggered.
+    bucket: Union[BucketType, Callable[[InteractionContext], Any]]
+        The type of cooldown to have. This defaults to ``BucketType.user``
+    storage: Optional[CooldownStorage]
+        The storage of the buckets. This defaults to :class:`MemoryCooldownStorage`.
+    """
+    cooldown_bucket = CooldownBucket(rate, per, bucket, storage)
+
+    async def predicate(ctx: InteractionContext) -> bool:
+        retry_after = await cooldown_bucket.get_retry_after(ctx)
+        if retry_after is not None:
+            raise CommandOnCooldown(cooldown_bucket.cooldown, retry_after, bucket)
+        return True
+
+    predicate.cooldown_bucket = cooldown_bucket
+    return check(predicate)
+
+
+async def update_cooldowns(ctx: InteractionContext, *checks: Callable):
+    """Takes a token from the cooldowns among the checks, after all checks have passed.
+
+    Raises
+    ------
+    CommandOnCooldown
+        A bucket became empty after the checks were evaluated.
+    """
+    for predicate in checks:
+        cooldown_bucket: CooldownBucket | None = getattr(
+            predicate, "cooldown_bucket", None
+        )
+        if cooldown_bucket is None:
+            continue
+        retry_after = await cooldown_bucket.update_rate_limit(ctx)
+        if retry_after is not None:
+            raise CommandOnCooldown(
+                cooldown_bucket.cooldown, retry_after, cooldown_bucket.type
+            )
+
+
+class _KeyedSemaphore:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, number: int):
+        self.semaphore = asyncio.Semaphore(number)
+        # The number of invocations holding or waiting for the semaphore.
+        self.users = 0
+
+
+class MaxConcurrency:
+    """Limits the number of invocations running at the same time, split by :class:`BucketType`.
+
+    A semaphore is created for a bucket when it is first used,
+    and removed when no invocation holds or waits for it.
+
+    Attributes
+    ----------
+    number: int
+        The maximum number of invocations running at the same time.
+    per: BucketType
+        The type of bucket.
+    wait: bool
+        Whether to wait until an invocation finishes when the limit is reached.
+        If ``False``, :exc:`.MaxConcurrencyReached` is raised instead.
+    """
+
+    def __init__(self, number: int, per: BucketType, wait: bool):
+        if number <= 0:
+            raise ValueError("max_concurrency number must be greater than 0.")
+        if not isinstance(per, BucketType):
+            raise TypeError(f"max_concurrency per must be a BucketType, not {per!r}")
+        self.number = number
+        self.per = per
+        self.wait = wait
+        self._semaphores: dict[Any, _KeyedSemaphore] = dict()
+
+    def __len__(self) -> int:
+        return len(self._semaphores)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, ctx: InteractionContext) -> AsyncIterator[None]:
+        key = _get_bucket_key(self.per, ctx)
+        keyed = self._semaphores.get(key)
+        if keyed is None:
+            keyed = self._semaphores[key] = _KeyedSemaphore(self.number)
+
+        if not self.wait and keyed.semaphore.locked():
+            raise MaxConcurrencyReached(self.number, self.per)
+
+        keyed.users += 1
+        try:
+            async with keyed.semaphore:
+                yield
+        finally:
+            keyed.users -= 1
+            if keyed.users == 0:
+                self._semaphores.pop(key, None)
+
+
+def max_concurrency(
+    number: int, per: BucketType = BucketType.default, *, wait: bool = False
+) -> Callable:
+    """A decorator that adds a maximum concurrency to a :class:`.Command`, :class:`.SubCommand`
+    or :class:`.DetectComponent`.
+
+    This enables you to only allow a certain number of invocations at the same time.
+    If the limit is reached and ``wait`` is ``False``, :exc:`.MaxConcurrencyReached` is raised
+    and the ``max_concurrency_reached`` event is called.
+
+    Parameters
+    ----------
+    number: int
+        The maximum number of invocations that can be running at the same time.
+    per: BucketType
+        The bucket that this concurrency is based on. This defaults to ``BucketType.default``
+    wait: bool
+        Whether to wait until an invocation finishes instead of raising an error.
+    """
+    value = MaxConcurrency(number, per, wait)
+
+    def decorator(func):
+        if isinstance(func, BaseCore):
+            func.max_concurrency = value
+        else:
+            func.__max_concurrency__ = value
+        return func
+
+    return decorator
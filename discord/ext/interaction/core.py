@@ -32,7 +32,51 @@ from .commands import (
     UserCommand,
     ContextMenu,
 )
-from .utils import async_all
+from .utils import async_all, async_all_concurrent, run_check
+
+
+class OptionBinder:
+    """Binds the options of an interaction to the keyword arguments of a callback.
+
+    The binder is compiled once from the options returned by :func:`get_signature_option`,
+    so invoking a command renames each option in a single pass.
+
+    Attributes
+    ----------
+    parameters: dict[str, str]
+        The option names mapped to the parameter names of the callback.
+    defaults: dict[str, Any]
+        The default values of the optional parameters.
+    """
+
+    __slots__ = ("parameters", "defaults")
+
+    def __init__(self, parameters: dict[str, str], defaults: dict[str, Any]):
+        self.parameters = parameters
+        self.defaults = defaults
+
+    @classmethod
+    def from_options(cls, func: Callable, options: list[CommandOption]):
+        signature_arguments = inspect.signature(func).parameters
+        parameters = dict()
+        defaults = dict()
+        for opt in options:
+            parameters[opt.name] = opt.parameter_name
+            argument = signature_arguments.get(opt.parameter_name)
+            if (
+                not opt.required
+                and argument is not None
+                and argument.default is not argument.empty
+            ):
+                defaults[opt.parameter_name] = argument.default
+        return cls(parameters, defaults)
+
+    def __call__(self, options: dict[str, Any]) -> dict[str, Any]:
+        kwargs = self.defaults.copy()
+        parameters = self.parameters
+        for name, value in options.items():
+            kwargs[parameters.get(name, name)] = value
+        return kwargs
 
 
 class BaseCore:
@@ -48,6 +92,8 @@ class BaseCore:
             decorator_checks.reverse()
             checks += decorator_checks
         self.checks: list = checks
+        self.max_concurrency = getattr(func, "__max_concurrency__", None)
+        self.binder: OptionBinder | None = None
         self.cog = None
 
     def __call__(self, *args, **kwargs):
@@ -64,7 +110,9 @@ class BaseCore:
             # since we have no checks, then we just return True.
             return True
 
-        return await async_all(predicate(ctx) for predicate in predicates)
+        if getattr(ctx.client, "concurrent_checks", False):
+            return await async_all_concurrent(predicates, ctx, invoke=run_check)
+        return await async_all(run_check(predicate, ctx) for predicate in predicates)
 
 
 # Subcommand
@@ -75,6 +123,7 @@ class SubCommand(BaseCore, ApplicationSubcommand):
         self.parents: Command | SubCommandGroup = parents
         self.top_parents: Command = kwargs.pop("top_parents", self.parents)
         self.parents.options.append(self)
+        self.top_parents._subcommands = None
 
         options = kwargs.get("options")
         if options is None:
@@ -99,6 +148,7 @@ class SubCommand(BaseCore, ApplicationSubcommand):
             self.options = get_signature_option(
                 self.func, self.base_options, skipping_argument=1
             )
+        self.binder = OptionBinder.from_options(self.func, self.options)
 
 
 class SubCommandGroup(BaseCore, ApplicationSubcommandGroup):
@@ -110,6 +160,7 @@ class SubCommandGroup(BaseCore, ApplicationSubcommandGroup):
         self.parents: Command = parents
         super().__init__(func=func, checks=checks, *args, **kwargs)
         self.parents.options.append(self)
+        self.parents._subcommands = None
 
     def subcommand(
         self,
@@ -171,6 +222,9 @@ class Command(BaseCommand, SlashCommand):
             func.__command_options__.reverse()
             options += func.__command_options__
         self.base_options = options
+        # (subcommand group name, subcommand name) to subcommand,
+        # built on first use and reset when a subcommand is attached.
+        self._subcommands: dict[tuple[str | None, str], SubCommand] | None = None
 
         # options = get_signature_option(func, options)
         super().__init__(
@@ -185,6 +239,7 @@ class Command(BaseCommand, SlashCommand):
         """Since add_interaction is called and cog information is entered in parents,
         parents value is reflected and skipping_argument value is determined.
         """
+        self._subcommands = None
         if self.is_subcommand:
             for opt in self.options:
                 opt.set_signature_option()
@@ -197,6 +252,7 @@ class Command(BaseCommand, SlashCommand):
                 self.options = get_signature_option(
                     self.func, self.base_options, skipping_argument=1
                 )
+            self.binder = OptionBinder.from_options(self.func, self.options)
         return
 
     def subcommand(
@@ -249,13 +305,30 @@ class Command(BaseCommand, SlashCommand):
 
         return decorator
 
+    @property
+    def subcommands(self) -> dict[tuple[str | None, str], SubCommand]:
+        """The subcommands of this command keyed by ``(group name, subcommand name)``.
+        The group name is ``None`` for subcommands not in a group.
+        """
+        if self._subcommands is None:
+            subcommands = dict()
+            for opt in self.options:
+                if isinstance(opt, SubCommand):
+                    subcommands[(None, opt.name)] = opt
+                elif isinstance(opt, SubCommandGroup):
+                    for sub_opt in opt.options:
+                        subcommands[(opt.name, sub_opt.name)] = sub_opt
+            self._subcommands = subcommands
+        return self._subcommands
+
     @property
     def is_subcommand(self) -> bool:
+        if len(self.subcommands) > 0:
+            return True
         for opt in self.options:
-            if isinstance(opt, (SubCommand, SubCommandGroup)):
+            if isinstance(opt, SubCommandGroup):
                 return True
-        else:
-            return False
+        return False
 
 
 class MemberCommand(BaseCommand, UserCommand):
@@ -276,6 +349,7 @@ def command(
     checks=None,
     options: list[CommandOption] = None,
     sync_command: bool = None,
+    guild_id: int | None = None,
 ):
     if options is None:
         options = []
@@ -291,6 +365,7 @@ def command(
             checks=checks,
             options=options,
             sync_command=sync_command,
+            guild_id=guild_id,
         )
 
     return decorator
@@ -301,12 +376,19 @@ def user(
     cls: classmethod = None,
     checks=None,
     sync_command: bool = None,
+    guild_id: int | None = None,
 ):
     if cls is None:
         cls = MemberCommand
 
     def decorator(func):
-        return cls(func, name=name, checks=checks, sync_command=sync_command)
+        return cls(
+            func,
+            name=name,
+            checks=checks,
+            sync_command=sync_command,
+            guild_id=guild_id,
+        )
 
     return decorator
 
@@ -316,12 +398,19 @@ def context(
     cls: classmethod = None,
     checks=None,
     sync_command: bool = None,
+    guild_id: int | None = None,
 ):
     if cls is None:
         cls = ContextMenuCommand
 
     def decorator(func):
-        return cls(func, name=name, checks=checks, sync_command=sync_command)
+        return cls(
+            func,
+            name=name,
+            checks=checks,
+            sync_command=sync_command,
+            guild_id=guild_id,
+        )
 
     return decorator
 
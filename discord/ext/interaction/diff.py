@@ -0,0 +1,340 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from typing import Any, Literal, NamedTuple
+
+from discord.utils import MISSING
+
+from .commands import ApplicationCommand
+from .manifest import get_fingerprint
+
+# Fields of an application command compared by the diff, in the order they are reported.
+COMMAND_FIELDS = (
+    "name",
+    "type",
+    "description",
+    "default_member_permissions",
+    "options",
+)
+OPTION_FIELDS = (
+    "name",
+    "type",
+    "description",
+    "required",
+    "autocomplete",
+    "choices",
+    "channel_types",
+    "min_value",
+    "max_value",
+    "min_length",
+    "max_length",
+    "options",
+)
+
+# Default values which Discord omits, so they are removed before comparing.
+_OPTION_DEFAULTS = {"required": False, "autocomplete": False}
+
+
+def normalize_option(data: dict) -> dict:
+    """Returns the canonical form of an application command option payload."""
+    result = dict()
+    for key in OPTION_FIELDS:
+        value = data.get(key)
+        if value is None or value == [] or _OPTION_DEFAULTS.get(key, MISSING) == value:
+            continue
+        if key == "choices":
+            value = [{"name": x["name"], "value": x["value"]} for x in value]
+        elif key == "channel_types":
+            value = sorted(value)
+        elif key == "options":
+            value = [normalize_option(x) for x in value]
+        result[key] = value
+    return result
+
+
+def normalize_command(data: dict | ApplicationCommand) -> dict:
+    """Returns the canonical form of an application command payload.
+
+    Fields set by Discord, such as ``id`` and ``version``, are removed and
+    missing values are unified, e.g. ``None`` and ``[]`` for choices.
+    The result for an :class:`ApplicationCommand` is memoized, so it must not be modified.
+
+    Parameters
+    ----------
+    data: Union[dict, ApplicationCommand]
+        The application command, or its payload.
+    """
+    command = None
+    if isinstance(data, ApplicationCommand):
+        command = data
+        data = command.to_register_dict()
+        # The canonical form is memoized with the payload it was built from.
+        cached = command.__dict__.get("_normalized")
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+    result = {"description": data.get("description") or ""}
+    for key in COMMAND_FIELDS:
+        value = data.get(key)
+        if value is None or value == [] or key == "description":
+            continue
+        if key == "options":
+            value = [normalize_option(x) for x in value]
+        result[key] = value
+    result.setdefault("type", 1)
+    if command is not None:
+        command.__dict__["_normalized"] = (data, result)
+    return result
+
+
+class FieldChange(NamedTuple):
+    """A changed field of an application command.
+
+    Attributes
+    ----------
+    path: str
+        The path of the field, e.g. ``options.user.description``
+    before: Any
+        The remote value.
+    after: Any
+        The local value.
+    """
+
+    path: str
+    before: Any
+    after: Any
+
+    def __str__(self):
+        return f"{self.path}: {self.before!r} -> {self.after!r}"
+
+
+class CommandChange(NamedTuple):
+    """A change to apply to an application command.
+
+    Attributes
+    ----------
+    action: Literal["create", "patch", "delete"]
+        The action to apply.
+    type: int
+        The type of application command.
+    name: str
+        The name of application command.
+    id: Optional[int]
+        The id of the remote command. ``None`` when the command is created.
+    payload: Optional[dict]
+        The request payload. ``patch`` only includes the changed top-level fields.
+    fields: list[FieldChange]
+        The changed fields of a ``patch``.
+    """
+
+    action: Literal["create", "patch", "delete"]
+    type: int
+    name: str
+    id: int | None
+    payload: dict | None
+    fields: list[FieldChange]
+
+    def __str__(self):
+        sign = {"create": "+", "patch": "~", "delete": "-"}[self.action]
+        lines = [f"{sign} {self.name} (type {self.type})"]
+        for field in self.fields:
+            lines.append(f"    {field}")
+        return "\n".join(lines)
+
+
+class CommandDiff(NamedTuple):
+    """The change set between local and remote application commands.
+
+    Attributes
+    ----------
+    changes: list[CommandChange]
+        The changes to apply, in the order of creations, patches and deletions.
+    unchanged: int
+        The number of commands that are the same on both sides.
+    """
+
+    changes: list[CommandChange]
+    unchanged: int
+
+    def __bool__(self):
+        return len(self.changes) > 0
+
+    @property
+    def create(self) -> list[CommandChange]:
+        return [x for x in self.changes if x.action == "create"]
+
+    @property
+    def patch(self) -> list[CommandChange]:
+        return [x for x in self.changes if x.action == "patch"]
+
+    @property
+    def delete(self) -> list[CommandChange]:
+        return [x for x in self.changes if x.action == "delete"]
+
+    def report(self) -> str:
+        """Returns a human-readable report of the changes."""
+        lines = [
+            f"{len(self.create)} to create, {len(self.patch)} to patch, "
+            f"{len(self.delete)} to delete, {self.unchanged} unchanged."
+        ]
+        for change in self.changes:
+            lines.append(str(change))
+        return "\n".join(lines)
+
+
+def _diff_value(path: str, before: Any, after: Any, result: list[FieldChange]):
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in dict.fromkeys([*before.keys(), *after.keys()]):
+            _diff_value(
+                f"{path}.{key}" if path else key,
+                before.get(key, MISSING),
+                after.get(key, MISSING),
+                result,
+            )
+    elif (
+        isinstance(before, list)
+        and isinstance(after, list)
+        and all(isinstance(x, dict) and "name" in x for x in before + after)
+    ):
+        # Options and choices are matched by name.
+        count = len(result)
+        before_map = {x["name"]: x for x in before}
+        after_map = {x["name"]: x for x in after}
+        for key in dict.fromkeys([*before_map.keys(), *after_map.keys()]):
+            _diff_value(
+                f"{path}.{key}",
+                before_map.get(key, MISSING),
+                after_map.get(key, MISSING),
+                result,
+            )
+        if len(result) == count and [x["name"] for x in before] != [
+            x["name"] for x in after
+        ]:
+            result.append(
+                FieldChange(
+                    f"{path} (order)",
+                    [x["name"] for x in before],
+                    [x["name"] for x in after],
+                )
+            )
+    elif before != after:
+        result.append(FieldChange(path, before, after))
+
+
+def diff_command(
+    local: dict | ApplicationCommand, remote: dict | ApplicationCommand
+) -> CommandChange | None:
+    """Compares a local application command with the remote one.
+
+    Returns
+    -------
+        A ``patch`` change with the changed top-level fields, or ``None`` if they are the same.
+    """
+    local_data = normalize_command(local)
+    remote_data = normalize_command(remote)
+    if get_fingerprint(local_data) == get_fingerprint(remote_data):
+        return
+
+    fields = []
+    payload = dict()
+    for key in COMMAND_FIELDS:
+        if key not in remote_data and key not in local_data:
+            continue
+        before = remote_data.get(key, MISSING)
+        after = local_data.get(key, MISSING)
+        if before == after:
+            continue
+        _field_changes = []
+        _diff_value(key, before, after, _field_changes)
+        fields += _field_changes
+        if key == "options":
+            payload[key] = local_data.get(key, [])
+        else:
+            payload[key] = local_data.get(key)
+
+    remote_id = remote.get("id") if isinstance(remote, dict) else remote.id
+    return CommandChange(
+        action="patch",
+        type=local_data["type"],
+        name=local_data["name"],
+        id=None if remote_id is None else int(remote_id),
+        payload=payload,
+        fields=fields,
+    )
+
+
+def diff_commands(
+    local: list[dict | ApplicationCommand],
+    remote: list[dict | ApplicationCommand],
+    delete_missing: bool = True,
+) -> CommandDiff:
+    """Computes the minimal change set turning the remote application commands into the local ones.
+
+    Parameters
+    ----------
+    local: list[Union[dict, ApplicationCommand]]
+        The desired application commands.
+    remote: list[Union[dict, ApplicationCommand]]
+        The application commands registered in Discord.
+    delete_missing: bool
+        Whether remote commands missing from ``local`` are deleted.
+    """
+    remote_map = dict()
+    for command in remote:
+        data = normalize_command(command)
+        remote_map[(data["type"], data["name"])] = command
+
+    creations = []
+    patches = []
+    unchanged = 0
+    for command in local:
+        data = normalize_command(command)
+        key = (data["type"], data["name"])
+        remote_command = remote_map.pop(key, None)
+        if remote_command is None:
+            creations.append(
+                CommandChange("create", key[0], key[1], None, data, fields=[])
+            )
+            continue
+
+        change = diff_command(data, remote_command)
+        if change is None:
+            unchanged += 1
+        else:
+            patches.append(change)
+
+    deletions = []
+    if delete_missing:
+        for (command_type, name), command in remote_map.items():
+            remote_id = command.get("id") if isinstance(command, dict) else command.id
+            deletions.append(
+                CommandChange(
+                    "delete",
+                    command_type,
+                    name,
+                    None if remote_id is None else int(remote_id),
+                    None,
+                    fields=[],
+                )
+            )
+    return CommandDiff(creations + patches + deletions, unchanged)
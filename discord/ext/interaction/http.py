@@ -262,3 +262,60 @@ class InteractionHTTPClient:
             message_id=message_id,
         )
         await self.http.request(r)
+
+    # Application Command
+    # Commands with guild_id are guild-scoped commands, the others are global commands.
+    async def get_commands(self, application_id: int, guild_id: int | None = None):
+        if guild_id is None:
+            return await self.http.get_global_commands(application_id)
+        return await self.http.get_guild_commands(application_id, guild_id)
+
+    async def get_command(
+        self, application_id: int, command_id: int, guild_id: int | None = None
+    ):
+        if guild_id is None:
+            return await self.http.get_global_command(application_id, command_id)
+        return await self.http.get_guild_command(application_id, guild_id, command_id)
+
+    async def upsert_command(
+        self, application_id: int, payload: dict[str, Any], guild_id: int | None = None
+    ):
+        if guild_id is None:
+            return await self.http.upsert_global_command(application_id, payload)
+        return await self.http.upsert_guild_command(application_id, guild_id, payload)
+
+    async def edit_command(
+        self,
+        application_id: int,
+        command_id: int,
+        payload: dict[str, Any],
+        guild_id: int | None = None,
+    ):
+        if guild_id is None:
+            return await self.http.edit_global_command(
+                application_id, command_id, payload
+            )
+        return await self.http.edit_guild_command(
+            application_id, guild_id, command_id, payload
+        )
+
+    async def delete_command(
+        self, application_id: int, command_id: int, guild_id: int | None = None
+    ):
+        if guild_id is None:
+            return await self.http.delete_global_command(application_id, command_id)
+        return await self.http.delete_guild_command(
+            application_id, guild_id, command_id
+        )
+
+    async def bulk_upsert_commands(
+        self,
+        application_id: int,
+        payload: list[dict[str, Any]],
+        guild_id: int | None = None,
+    ):
+        if guild_id is None:
+            return await self.http.bulk_upsert_global_commands(application_id, payload)
+        return await self.http.bulk_upsert_guild_commands(
+            application_id, guild_id, payload
+        )
@@ -23,6 +23,7 @@ SOFTWARE.
 
 import logging
 from collections.abc import Sequence
+from functools import cached_property
 
 import discord
 from discord.channel import _channel_factory
@@ -47,6 +48,75 @@ from .utils import get_as_snowflake, channel_types, get_enum
 log = logging.getLogger()
 
 
+class PartialGuild(discord.Object):
+    """Represents a guild built from the interaction payload only.
+
+    This is used instead of :class:`discord.Guild` when the client runs with ``cacheless_context``,
+    so the guild does not have to be in the client cache.
+
+    Attributes
+    ----------
+    id: int
+        The guild's ID.
+    preferred_locale: Optional[Locale]
+        Selected language of the guild
+    """
+
+    def __init__(self, id: int, state: ConnectionState, locale: Locale = None):
+        super().__init__(id=id)
+        self._state = state
+        self.preferred_locale = locale
+        self.me = None
+        self.owner_id = None
+        self.default_role = None
+        self.voice_client = None
+
+    def __repr__(self) -> str:
+        return f"<PartialGuild id={self.id}>"
+
+    def get_member(self, _: int) -> None:
+        return
+
+    def get_role(self, _: int) -> None:
+        return
+
+    def get_channel(self, _: int) -> None:
+        return
+
+    def _voice_state_for(self, _: int) -> None:
+        return
+
+
+class PartialMember(discord.Member):
+    """Represents a member built from the interaction payload only.
+
+    This is used instead of :class:`discord.Member` when the client runs with ``cacheless_context``.
+    The roles of the guild are not known, so :attr:`roles` is empty and :attr:`top_role`
+    raises :exc:`discord.ClientException`. The ids of the roles are in
+    :attr:`InteractionContext.author_role_ids`.
+    """
+
+    __slots__ = ("_permissions",)
+
+    def __init__(self, *, data: dict, guild: PartialGuild, state: ConnectionState):
+        super().__init__(data=data, guild=guild, state=state)
+        self._permissions = discord.Permissions(int(data.get("permissions", 0)))
+
+    @property
+    def guild_permissions(self) -> discord.Permissions:
+        """The permissions sent with the interaction.
+
+        These are the permissions in the channel of the interaction, including its overwrites.
+        """
+        return self._permissions
+
+    @property
+    def top_role(self) -> discord.Role:
+        raise discord.ClientException(
+            "top_role is not available for a context built without the client cache."
+        )
+
+
 class InteractionContext:
     """Represents an interaction context from Discord
 
@@ -64,6 +134,10 @@ class InteractionContext:
         The interaction's token for response.
     application: int
         The interaction's application id
+    guild_id: Optional[int]
+        The id of the guild the interaction was sent from.
+    channel_id: Optional[int]
+        The id of the channel the interaction was sent from.
     author: Union[discord.Member, discord.User]
         The user or member that sent the interaction.
     created_at: datetime.datetime
@@ -72,6 +146,12 @@ class InteractionContext:
         Selected language of the invoking user
     guild_locale: Locale
         Selected language of the invoking guild
+    permissions: Optional[discord.Permissions]
+        Permissions of the invoking member in the channel, as sent with the interaction.
+    app_permissions: Optional[discord.Permissions]
+        Permissions of the bot in the channel, as sent with the interaction.
+    cacheless: bool
+        Whether the context is built from the interaction payload without looking up the client cache.
     deferred: bool
         When ``defer`` called, deferred becomes ``True``
     responded: bool
@@ -90,24 +170,42 @@ class InteractionContext:
 
         self._state: ConnectionState = getattr(client, "_connection")
 
-        self.guild_id = payload.get("guild_id")
-        self.channel_id = payload.get("channel_id")
+        self.cacheless: bool = getattr(client, "cacheless_context", False)
+        self.guild_id: int | None = get_as_snowflake(payload, "guild_id")
+        self.channel_id: int | None = get_as_snowflake(payload, "channel_id")
+        self._channel_data: dict = payload.get("channel") or {}
 
-        if self.guild is not None:
-            member = payload.get("member")
-            self.author = discord.Member(
-                data=member, state=self._state, guild=self.guild
-            )
-        else:
-            user = payload.get("user")
-            self.author = discord.User(data=user, state=self._state)
         self.created_at = discord.utils.snowflake_time(self.id)
         self.locale = get_enum(Locale, payload.get("locale"))
         self.guild_locale = get_enum(Locale, payload.get("guild_locale"))
 
+        payload_cache = getattr(client, "payload_cache", None)
+        if payload_cache is not None:
+            payload_cache.store(payload)
+
+        member = payload.get("member")
+        guild = self.guild
+        if isinstance(guild, PartialGuild) and member is not None:
+            self.author = PartialMember(data=member, state=self._state, guild=guild)
+        elif guild is not None and member is not None:
+            self.author = discord.Member(data=member, state=self._state, guild=guild)
+        else:
+            user = payload.get("user") or (member or {}).get("user")
+            self.author = discord.User(data=user, state=self._state)
+
+        self.permissions: discord.Permissions | None = None
+        if member is not None and "permissions" in member:
+            self.permissions = discord.Permissions(int(member["permissions"]))
+        self.app_permissions: discord.Permissions | None = None
+        if "app_permissions" in payload:
+            self.app_permissions = discord.Permissions(int(payload["app_permissions"]))
+
         self.deferred = False
         self.responded = False
 
+        # Results of the checks evaluated for this interaction, keyed by predicate.
+        self._check_results: dict = {}
+
         self.data = InteractionData(
             token=self.token, id=self.id, application_id=self.application
         )
@@ -116,27 +214,42 @@ class InteractionContext:
         else:
             self.http = InteractionHTTPClient(http=self.client.http)
 
-    @property
+    @cached_property
     def guild(self) -> discord.Guild | None:
-        """The guild the interaction was sent from."""
+        """The guild the interaction was sent from.
+
+        The lookup is done once and reused for the lifetime of the context.
+        """
         if self.guild_id is not None:
-            return self.client.get_guild(int(self.guild_id))
+            if self.cacheless:
+                return PartialGuild(
+                    id=self.guild_id, state=self._state, locale=self.guild_locale
+                )
+            return self.client.get_guild(self.guild_id)
         return
 
-    @property
+    @cached_property
     def channel(self) -> discord.TextChannel | discord.PartialMessageable | None:
-        """The channel the interaction was sent from."""
+        """The channel the interaction was sent from.
+
+        The lookup is done once and reused for the lifetime of the context.
+        """
         if self.channel_id is not None:
-            if self.guild is not None:
-                channel = self.guild.get_channel(int(self.channel_id))
+            guild = self.guild
+            if guild is not None and not self.cacheless:
+                channel = guild.get_channel(self.channel_id)
             else:
-                tp = (
-                    discord.ChannelType.text
-                    if self.guild_id is not None
-                    else discord.ChannelType.private
-                )
+                if "type" in self._channel_data:
+                    tp = get_enum(discord.ChannelType, self._channel_data["type"])
+                elif self.guild_id is not None:
+                    tp = discord.ChannelType.text
+                else:
+                    tp = discord.ChannelType.private
                 channel = discord.PartialMessageable(
-                    state=self._state, id=self.channel_id, type=tp
+                    state=self._state,
+                    id=self.channel_id,
+                    guild_id=self.guild_id,
+                    type=tp,
                 )
             return channel
         return
@@ -165,11 +278,30 @@ class InteractionContext:
             payload["components"] = components
         return payload
 
+    @cached_property
+    def author_role_ids(self) -> frozenset[int]:
+        """IDs of the roles of the invoking member, including the ``@everyone`` role.
+
+        This is built once from the ``member.roles`` of the interaction payload.
+        """
+        if not isinstance(self.author, discord.Member):
+            return frozenset()
+        return frozenset(self.author._roles).union((self.guild_id,))
+
+    @property
+    def me(self) -> discord.Member | discord.ClientUser | None:
+        """The bot itself, as a member of the guild if the interaction was sent from a guild."""
+        guild = self.guild
+        if guild is not None and guild.me is not None:
+            return guild.me
+        return self.client.user
+
     @property
     def voice_client(self) -> discord.VoiceClient | None:
-        if self.guild is None:
+        guild = self.guild
+        if guild is None:
             return None
-        return self.guild.voice_client
+        return guild.voice_client
 
     async def defer(self, hidden: bool = False):
         """Defers the interaction response.
@@ -390,6 +522,23 @@ class BaseApplicationContext(ModalPossible):
         self.target_id = data.get("target_id")
         self._resolved = data.get("resolved", {})
 
+    def _get_guild(self, guild_id: int) -> discord.Guild | PartialGuild | None:
+        if guild_id == self.guild_id:
+            return self.guild
+        if self.cacheless:
+            return
+        return self.client.get_guild(guild_id)
+
+    def _get_user(self, user_id: int) -> discord.User | None:
+        if self.cacheless:
+            return
+        return self.client.get_user(user_id)
+
+    def _get_channel(self, channel_id: int):
+        if self.cacheless:
+            return
+        return self.client.get_channel(channel_id)
+
     def target(self, target_type, target_id: int = None):
         if target_id is None:
             target_id = self.target_id
@@ -453,8 +602,8 @@ class BaseApplicationContext(ModalPossible):
                 if "position" not in data:
                     data["position"] = None
 
-                guild_id = int(data.get("guild_id") or self.guild_id)
-                guild = self.client.get_guild(guild_id) or discord.Object(id=guild_id)
+                guild_id = get_as_snowflake(data, "guild_id") or self.guild_id
+                guild = self._get_guild(guild_id) or discord.Object(id=guild_id)
                 channel = factory(guild=guild, state=self._state, data=data)
 
             return channel
@@ -463,17 +612,25 @@ class BaseApplicationContext(ModalPossible):
 class SubcommandContext(BaseApplicationContext):
     """Represents a Discord interaction subcommand response.
 
+    The context shares the author, guild, channel and permissions of its parent context,
+    which are built once per interaction.
+
     Attributes
     ----------
     name: str
         The name of the interaction.
+    option_type: int
+        The option type of the subcommand: 1 for a subcommand, 2 for a subcommand group.
     options: dict[str, Any]
         All response options
     """
 
-    def __init__(self, original_payload: dict, payload: dict, client):
-        super().__init__(original_payload, client)
+    def __init__(self, parent: BaseApplicationContext, payload: dict, client):
+        # The parent context has already been built from the interaction payload.
+        self.__dict__.update(parent.__dict__)
+        self._parent = parent
         self.name = payload.get("name")
+        self.option_type: int = payload.get("type")
         self.options = {}
 
         for option in payload.get("options", []):
@@ -482,9 +639,7 @@ class SubcommandContext(BaseApplicationContext):
             option_type = option.get("type")
 
             if option_type == 1:
-                self.options["subcommand"] = SubcommandContext(
-                    original_payload, option, client
-                )
+                self.options["subcommand"] = SubcommandContext(self, option, client)
             elif option_type == 3:
                 self.options[key]: str = value
             elif option_type == 4:
@@ -493,20 +648,20 @@ class SubcommandContext(BaseApplicationContext):
                 self.options[key] = bool(value)
             elif option_type == 6:
                 if self.guild is not None:
-                    self.options[key] = self.guild.get_member(value) or self.target(
-                        "members", target_id=value
-                    )
+                    self.options[key] = self.guild.get_member(
+                        int(value)
+                    ) or self.target("members", target_id=value)
                 else:
-                    self.options[key] = client.get_user(value) or self.target(
+                    self.options[key] = self._get_user(int(value)) or self.target(
                         "users", target_id=value
                     )
             elif option_type == 7:
-                self.options[key]: channel_types | None = client.get_channel(
-                    value
+                self.options[key]: channel_types | None = self._get_channel(
+                    int(value)
                 ) or self.target("channels", target_id=value)
             elif option_type == 8:
                 self.options[key]: discord.Role | None = self.guild.get_role(
-                    value
+                    int(value)
                 ) or self.target("roles", target_id=value)
             elif option_type == 10:
                 self.options[key]: float = float(value)
@@ -518,6 +673,19 @@ class SubcommandContext(BaseApplicationContext):
             else:
                 self.options[key] = value
 
+    # The lookups are cached on the top-level context and shared by every subcommand.
+    @property
+    def guild(self) -> discord.Guild | None:
+        return self._parent.guild
+
+    @property
+    def channel(self) -> discord.TextChannel | discord.PartialMessageable | None:
+        return self._parent.channel
+
+    @property
+    def author_role_ids(self) -> frozenset[int]:
+        return self._parent.author_role_ids
+
 
 class ApplicationContext(BaseApplicationContext):
     """Represents a Discord interaction response.
@@ -540,6 +708,7 @@ class ApplicationContext(BaseApplicationContext):
 
         self.application_type = data.get("type")
         self.name = data.get("name")
+        self.command_id: int | None = get_as_snowflake(data, "id")
         if self.application_type == 1:
             self.options = {}
             self.option_focused = []
@@ -552,12 +721,10 @@ class ApplicationContext(BaseApplicationContext):
                     self.option_focused.append(key)
 
                 if option_type == 1:
-                    self.options["subcommand"] = SubcommandContext(
-                        payload, option, client
-                    )
+                    self.options["subcommand"] = SubcommandContext(self, option, client)
                 elif option_type == 2:
                     self.options["subcommand_group"] = SubcommandContext(
-                        payload, option, client
+                        self, option, client
                     )
                 elif option_type == 3:
                     self.options[key]: str = value
@@ -567,20 +734,20 @@ class ApplicationContext(BaseApplicationContext):
                     self.options[key] = bool(value)
                 elif option_type == 6:
                     if self.guild is not None:
-                        self.options[key] = self.guild.get_member(value) or self.target(
-                            "members", target_id=value
-                        )
+                        self.options[key] = self.guild.get_member(
+                            int(value)
+                        ) or self.target("members", target_id=value)
                     else:
-                        self.options[key] = client.get_user(value) or self.target(
+                        self.options[key] = self._get_user(int(value)) or self.target(
                             "users", target_id=value
                         )
                 elif option_type == 7:
-                    self.options[key]: channel_types | None = client.get_channel(
-                        value
+                    self.options[key]: channel_types | None = self._get_channel(
+                        int(value)
                     ) or self.target("channels", target_id=value)
                 elif option_type == 8:
                     self.options[key]: discord.Role | None = self.guild.get_role(
-                        value
+                        int(value)
                     ) or self.target("roles", target_id=value)
                 elif option_type == 10:
                     self.options[key]: float = float(value)
@@ -592,8 +759,6 @@ class ApplicationContext(BaseApplicationContext):
                 else:
                     self.options[key] = value
 
-        self.command_id = data.get("id")
-
     @property
     def content(self):
         if self.application_type == 1:
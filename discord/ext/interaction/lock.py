@@ -0,0 +1,285 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from abc import *
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    HAS_FCNTL = False
+else:
+    HAS_FCNTL = True
+
+
+class SyncLock(metaclass=ABCMeta):
+    """A lock electing the process that synchronizes application commands.
+
+    The process acquiring the lock synchronizes commands and publishes their ids.
+    The other processes wait for the published ids instead of synchronizing commands.
+    """
+
+    @abstractmethod
+    async def acquire(self) -> bool:
+        """Tries to acquire the lock without waiting.
+
+        Returns
+        -------
+            ``True`` if this process holds the lock and should synchronize commands.
+        """
+        pass
+
+    @abstractmethod
+    async def publish(self, commands: list[dict]):
+        """Publishes the ids of synchronized commands to the other processes.
+        This is only called by the process holding the lock.
+
+        Parameters
+        ----------
+        commands: list[dict]
+            The ids of commands returned by :func:`get_command_ids`.
+        """
+        pass
+
+    @abstractmethod
+    async def wait(self) -> list[dict]:
+        """Waits until the process holding the lock publishes the ids of commands.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            The ids were not published in time.
+        ConnectionError
+            The process holding the lock has stopped.
+        """
+        pass
+
+    async def abort(self):
+        """Tells the other processes that synchronization failed,
+        so they stop waiting and fetch the command ids by themselves.
+        This is only called by the process holding the lock. It releases the lock by default.
+        """
+        await self.close()
+
+    async def close(self):
+        """Releases the lock."""
+        pass
+
+
+# The default seconds to wait for the ids published by the process holding the lock.
+DEFAULT_WAIT_TIMEOUT = 300.0
+
+
+class FileSyncLock(SyncLock):
+    """A :class:`SyncLock` for processes on the same host, using an advisory file lock.
+
+    The lock is held until the process closes the client or exits,
+    and the published ids are written to ``path``. This requires :mod:`fcntl`.
+
+    Parameters
+    ----------
+    path: Union[str, os.PathLike]
+        The path of the file storing the published ids. ``{path}.lock`` is used as the lock file.
+    timeout: Optional[float]
+        The seconds to wait for the ids. This defaults to 5 minutes.
+        ``None`` waits until the ids are published or the lock is released.
+    poll_interval: float
+        The seconds between reading the published ids.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        timeout: float | None = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = 0.5,
+    ):
+        if not HAS_FCNTL:
+            raise RuntimeError("FileSyncLock requires fcntl.")
+        self.path = os.fspath(path)
+        self.lock_path = f"{self.path}.lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fp = None
+        self._token: str | None = None
+
+    async def acquire(self) -> bool:
+        # File locking and I/O are blocking, so they run in a thread.
+        return await asyncio.to_thread(self._acquire)
+
+    def _acquire(self) -> bool:
+        if self._fp is not None:
+            return True
+
+        fp = open(self.lock_path, "a+", encoding="utf-8")
+        try:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fp.close()
+            return False
+
+        # The token tells the ids published by this process from older ones.
+        self._fp = fp
+        self._token = uuid.uuid4().hex
+        fp.seek(0)
+        fp.truncate()
+        fp.write(self._token)
+        fp.flush()
+        return True
+
+    async def publish(self, commands: list[dict]):
+        await asyncio.to_thread(self._publish, commands)
+
+    def _publish(self, commands: list[dict]):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as fp:
+            json.dump({"token": self._token, "commands": commands}, fp)
+        os.replace(temporary_path, self.path)
+
+    def _read(self) -> list[dict] | None:
+        try:
+            with open(self.lock_path, encoding="utf-8") as fp:
+                token = fp.read()
+            with open(self.path, encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return
+        if token == "" or data.get("token") != token:
+            return
+        return data["commands"]
+
+    def _is_locked(self) -> bool:
+        with open(self.lock_path, "a+", encoding="utf-8") as fp:
+            try:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+            return False
+
+    async def _wait(self) -> list[dict]:
+        while True:
+            commands = await asyncio.to_thread(self._read)
+            if commands is not None:
+                return commands
+            if not await asyncio.to_thread(self._is_locked):
+                raise ConnectionError("The process holding the lock has stopped.")
+            await asyncio.sleep(self.poll_interval)
+
+    async def wait(self) -> list[dict]:
+        return await asyncio.wait_for(self._wait(), timeout=self.timeout)
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+    def _close(self):
+        if self._fp is None:
+            return
+        fcntl.flock(self._fp.fileno(), fcntl.LOCK_UN)
+        self._fp.close()
+        self._fp = None
+
+
+class TCPSyncLock(SyncLock):
+    """A :class:`SyncLock` for processes on the same host, using a local TCP port.
+
+    The process listening on the port holds the lock,
+    and the other processes receive the published ids by connecting to it.
+    This is a stand-in for a distributed lock service.
+
+    Parameters
+    ----------
+    port: int
+        The port to listen on.
+    host: str
+        The host to listen on. This defaults to ``127.0.0.1``
+    timeout: Optional[float]
+        The seconds to wait for the ids. This defaults to 5 minutes.
+        ``None`` waits until the ids are published or the lock is released.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "127.0.0.1",
+        timeout: float | None = DEFAULT_WAIT_TIMEOUT,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._server: asyncio.AbstractServer | None = None
+        self._commands: list[dict] | None = None
+        self._published = asyncio.Event()
+
+    async def acquire(self) -> bool:
+        if self._server is not None:
+            return True
+
+        try:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port
+            )
+        except OSError:
+            return False
+        return True
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await self._published.wait()
+            if self._commands is not None:
+                writer.write(json.dumps(self._commands).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def publish(self, commands: list[dict]):
+        self._commands = commands
+        self._published.set()
+
+    async def abort(self):
+        # Waiting processes are disconnected without the ids.
+        self._commands = None
+        self._published.set()
+        await self.close()
+
+    async def _wait(self) -> list[dict]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            line = await reader.readline()
+        finally:
+            writer.close()
+        if not line:
+            raise ConnectionError("The process holding the lock has stopped.")
+        return json.loads(line)
+
+    async def wait(self) -> list[dict]:
+        return await asyncio.wait_for(self._wait(), timeout=self.timeout)
+
+    async def close(self):
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
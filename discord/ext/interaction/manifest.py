@@ -0,0 +1,121 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import json
+import os
+
+from .commands import ApplicationCommand
+
+
+def get_manifest(commands: list[ApplicationCommand]) -> list[dict]:
+    """Returns the registration payloads of application commands in a canonical order.
+    The payloads of guild commands include ``guild_id``.
+
+    Parameters
+    ----------
+    commands: list[ApplicationCommand]
+        The application commands to include.
+    """
+    manifest = []
+    for command in commands:
+        data = dict(command.to_register_dict())
+        if command.guild_id is not None:
+            data["guild_id"] = str(command.guild_id)
+        manifest.append(data)
+    manifest.sort(key=lambda x: (int(x.get("guild_id", 0)), x["type"], x["name"]))
+    return manifest
+
+
+def get_fingerprint(data) -> str:
+    """Returns the SHA-256 hash of the canonical JSON representation of ``data``."""
+    canonical = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_sync_state(path: str | os.PathLike) -> dict | None:
+    """Loads the state stored by :func:`save_sync_state`.
+
+    Returns
+    -------
+        The stored state, or ``None`` if the file does not exist or cannot be read.
+    """
+    try:
+        with open(path, encoding="utf-8") as fp:
+            state = json.load(fp)
+    except (OSError, ValueError):
+        return
+    if not isinstance(state, dict) or "fingerprint" not in state:
+        return
+    return state
+
+
+def get_command_ids(commands: list[ApplicationCommand]) -> list[dict]:
+    """Returns the ids and versions of application commands,
+    keyed by their type, name and guild id.
+    """
+    return [
+        {
+            "type": command.type.value,
+            "name": command.name,
+            "guild_id": None if command.guild_id is None else str(command.guild_id),
+            "id": str(command.id),
+            "version": None if command.version is None else str(command.version),
+        }
+        for command in commands
+    ]
+
+
+def save_sync_state(
+    path: str | os.PathLike, fingerprint: str, commands: list[ApplicationCommand]
+):
+    """Stores the fingerprint of a synchronized manifest
+    with the ids and versions of the remote commands.
+
+    Parameters
+    ----------
+    path: Union[str, os.PathLike]
+        The path of the state file.
+    fingerprint: str
+        The fingerprint of the synchronized manifest.
+    commands: list[ApplicationCommand]
+        The synchronized commands.
+    """
+    state = {
+        "fingerprint": fingerprint,
+        "commands": get_command_ids(commands),
+    }
+    temporary_path = f"{os.fspath(path)}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as fp:
+        json.dump(state, fp, ensure_ascii=False, indent=2)
+    os.replace(temporary_path, path)
+
+
+def delete_sync_state(path: str | os.PathLike):
+    """Removes the state stored by :func:`save_sync_state`, if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,208 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import re
+from typing import Any, Callable, Generic, TypeVar
+
+V = TypeVar("V")
+
+# The converters of typed segments, with the regular expression matching their values.
+SEGMENT_TYPES: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "str": (r".+?", str),
+    "int": (r"-?\d+", int),
+    "float": (r"-?\d+(?:\.\d+)?", float),
+}
+
+_SEGMENT = re.compile(r"\{(\w+)(?::(\w+))?\}")
+
+
+def _get_literal(pattern: str) -> str:
+    first_segment = _SEGMENT.search(pattern)
+    if first_segment is None:
+        return pattern
+    return pattern[: first_segment.start()]
+
+
+class CustomIdPattern:
+    """A compiled custom_id pattern.
+
+    A template contains segments such as ``{poll_id}`` or ``{poll_id:int}``,
+    e.g. ``vote:{poll_id:int}:{choice}``. A segment captures a part of the custom_id
+    and converts it with its type, which is one of ``str`` (default), ``int`` and ``float``.
+
+    Attributes
+    ----------
+    pattern: str
+        The template of the custom_id.
+    prefix: bool
+        Whether the custom_id only has to start with the template.
+    literal: str
+        The constant text before the first segment.
+    converters: dict[str, Callable[[str], Any]]
+        The converters of the segments by their names.
+    """
+
+    def __init__(self, pattern: str, prefix: bool = False):
+        self.pattern = pattern
+        self.prefix = prefix
+        self.converters: dict[str, Callable[[str], Any]] = dict()
+
+        expression = []
+        position = 0
+        for match in _SEGMENT.finditer(pattern):
+            name, segment_type = match.group(1), match.group(2) or "str"
+            if segment_type not in SEGMENT_TYPES:
+                raise ValueError(
+                    f"Unknown segment type {segment_type!r} in {pattern!r}"
+                )
+            if name in self.converters:
+                raise ValueError(f"Duplicate segment {name!r} in {pattern!r}")
+            regex, converter = SEGMENT_TYPES[segment_type]
+            start = match.start()
+            expression.append(re.escape(pattern[position:start]))
+            expression.append(f"(?P<{name}>{regex})")
+            self.converters[name] = converter
+            position = match.end()
+        expression.append(re.escape(pattern[position:]))
+
+        self.literal = _get_literal(pattern)
+        if prefix:
+            expression.append(".*")
+        self._regex = re.compile("".join(expression), re.DOTALL)
+
+    def match(self, custom_id: str) -> dict[str, Any] | None:
+        """Returns the converted segments if the custom_id matches, otherwise ``None``."""
+        if len(self.converters) == 0 and not self.prefix:
+            return dict() if custom_id == self.pattern else None
+        if len(self.converters) == 0:
+            return dict() if custom_id.startswith(self.pattern) else None
+
+        match = self._regex.fullmatch(custom_id)
+        if match is None:
+            return
+        return {
+            name: self.converters[name](value)
+            for name, value in match.groupdict().items()
+        }
+
+    def __repr__(self):
+        return f"<CustomIdPattern pattern={self.pattern!r} prefix={self.prefix}>"
+
+
+class _TrieNode:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = dict()
+        self.items: list[tuple[CustomIdPattern, Any]] = list()
+
+
+class CustomIdRouter(Generic[V]):
+    """An index of custom_id patterns.
+
+    Patterns are stored in a trie by their constant text before the first segment.
+    A custom_id is matched by walking the trie along its characters once,
+    so only the patterns whose constant text it starts with are tested.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _node(self, literal: str, create: bool = False) -> _TrieNode | None:
+        node = self._root
+        for character in literal:
+            child = node.children.get(character)
+            if child is None:
+                if not create:
+                    return
+                child = node.children[character] = _TrieNode()
+            node = child
+        return node
+
+    def add(self, pattern: CustomIdPattern, value: V):
+        """Adds the value matched by the pattern."""
+        self._node(pattern.literal, create=True).items.append((pattern, value))
+        self._count += 1
+
+    def remove(self, pattern: str, value: V | None = None) -> list[V]:
+        """Removes the values of the pattern. If value is given, only the value is removed.
+
+        Returns
+        -------
+            The removed values.
+        """
+        literal = _get_literal(pattern)
+        node = self._node(literal)
+        if node is None:
+            return []
+
+        removed = []
+        items = []
+        for item in node.items:
+            if item[0].pattern == pattern and (
+                value is None or (item[1] is value and len(removed) == 0)
+            ):
+                removed.append(item[1])
+                continue
+            items.append(item)
+        node.items = items
+        self._count -= len(removed)
+        return removed
+
+    def values(self) -> dict[str, list[V]]:
+        """Returns the values by their pattern."""
+        result = dict()
+        nodes = [self._root]
+        while len(nodes) > 0:
+            node = nodes.pop()
+            for pattern, value in node.items:
+                result.setdefault(pattern.pattern, []).append(value)
+            nodes += node.children.values()
+        return result
+
+    def match(self, custom_id: str) -> list[tuple[V, dict[str, Any]]]:
+        """Returns the values whose pattern matches the custom_id, with the converted segments.
+        Patterns with a shorter constant text come first.
+        """
+        result = []
+        if self._count == 0:
+            return result
+
+        node = self._root
+        index = 0
+        while True:
+            for pattern, value in node.items:
+                arguments = pattern.match(custom_id)
+                if arguments is not None:
+                    result.append((value, arguments))
+            if index >= len(custom_id):
+                break
+            node = node.children.get(custom_id[index])
+            if node is None:
+                break
+            index += 1
+        return result
@@ -0,0 +1,164 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+from collections import deque
+from typing import Literal, NamedTuple
+
+import discord
+
+from .diff import CommandChange
+
+# Discord allows an application to create 200 application commands per day.
+DAILY_COMMAND_CREATE_LIMIT = 200
+
+
+class SyncOperation(NamedTuple):
+    """The result of a change applied by a command synchronization.
+
+    Attributes
+    ----------
+    change: CommandChange
+        The applied change.
+    status: Literal["success", "failed", "skipped"]
+        Whether the change was applied.
+        ``skipped`` means the daily command creation quota has been reached.
+    duration: float
+        The seconds taken to apply the change, including waiting for rate limits.
+    error: Optional[Exception]
+        The error raised while applying the change.
+    """
+
+    change: CommandChange
+    status: Literal["success", "failed", "skipped"]
+    duration: float
+    error: Exception | None = None
+
+    @property
+    def rate_limited(self) -> bool:
+        """Whether the change was rejected with HTTP status 429."""
+        if isinstance(self.error, discord.RateLimited):
+            return True
+        return (
+            isinstance(self.error, discord.HTTPException) and self.error.status == 429
+        )
+
+
+class SyncReport:
+    """The report of a command synchronization.
+
+    Attributes
+    ----------
+    guild_id: Optional[int]
+        The guild id of synchronized guild commands. ``None`` for global commands.
+    operations: list[SyncOperation]
+        The results of the applied changes.
+    duration: float
+        The seconds taken by the whole synchronization.
+    """
+
+    def __init__(self, guild_id: int | None = None):
+        self.guild_id = guild_id
+        self.operations: list[SyncOperation] = []
+        self.duration: float = 0.0
+
+    def __repr__(self):
+        return (
+            f"<SyncReport guild_id={self.guild_id} operations={len(self.operations)} "
+            f"failed={len(self.failed)} duration={self.duration:.2f}>"
+        )
+
+    @property
+    def failed(self) -> list[SyncOperation]:
+        return [x for x in self.operations if x.status == "failed"]
+
+    @property
+    def skipped(self) -> list[SyncOperation]:
+        return [x for x in self.operations if x.status == "skipped"]
+
+    @property
+    def rate_limited(self) -> int:
+        """The number of changes rejected with HTTP status 429.
+
+        Rate limits waited out by :class:`discord.http.HTTPClient` are retried
+        and do not fail the change, so they are not counted.
+        """
+        return len([x for x in self.operations if x.rate_limited])
+
+    def summary(self) -> str:
+        """Returns a human-readable summary of the synchronization."""
+        scope = "" if self.guild_id is None else f" of guild {self.guild_id}"
+        lines = [
+            f"Synchronized {len(self.operations)} application command changes{scope} "
+            f"in {self.duration:.2f}s ({len(self.failed)} failed, {len(self.skipped)} skipped, "
+            f"{self.rate_limited} rate limited)."
+        ]
+        for operation in self.operations:
+            change = operation.change
+            line = f"{change.action} {change.name}: {operation.status} ({operation.duration:.2f}s)"
+            if operation.error is not None:
+                line += f" {operation.error!r}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class CommandCreateQuota:
+    """Tracks the application commands created in the last 24 hours.
+
+    Discord counts the quota per scope, so one instance is used for the global
+    commands and one for each guild. The creations are only counted in memory,
+    so creations made by other processes or before a restart are not known.
+
+    Parameters
+    ----------
+    limit: int
+        The number of commands that can be created per day.
+    """
+
+    def __init__(self, limit: int = DAILY_COMMAND_CREATE_LIMIT):
+        self.limit = limit
+        self._created: deque[float] = deque()
+
+    @property
+    def remaining(self) -> int:
+        self._expire(time.monotonic())
+        return max(self.limit - len(self._created), 0)
+
+    def _expire(self, current: float):
+        while len(self._created) > 0 and current - self._created[0] >= 86400:
+            self._created.popleft()
+
+    def acquire(self) -> bool:
+        """Reserves a command creation. Returns ``False`` if the quota has been reached."""
+        current = time.monotonic()
+        self._expire(current)
+        if len(self._created) >= self.limit:
+            return False
+        self._created.append(current)
+        return True
+
+    def exhaust(self):
+        """Marks the quota as reached, e.g. after Discord rejected a creation."""
+        current = time.monotonic()
+        while len(self._created) < self.limit:
+            self._created.append(current)
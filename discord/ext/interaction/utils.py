@@ -21,10 +21,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
 import json
 import inspect
 import logging
 import discord
+from discord.utils import MISSING
 
 try:
     import orjson
@@ -74,11 +76,23 @@ def get_as_snowflake(data, key):
         return value and int(value)
 
 
+# The value-to-member maps of enums, built on the first lookup of each enum.
+_enum_value_maps: dict[type, dict] = dict()
+
+
 def get_enum(cls, val):
-    enum_val = [i for i in cls if i.value == val]
-    if len(enum_val) == 0:
+    """Returns the member of ``cls`` with the value, or the value itself if there is none."""
+    value_map = _enum_value_maps.get(cls)
+    if value_map is None:
+        value_map = dict()
+        for member in cls:
+            value_map.setdefault(member.value, member)
+        _enum_value_maps[cls] = value_map
+    try:
+        return value_map.get(val, val)
+    except TypeError:
+        # An unhashable value can't be a member.
         return val
-    return enum_val[0]
 
 
 def to_json(obj):
@@ -92,3 +106,79 @@ async def async_all(gen, *, check=inspect.isawaitable):
         if not elem:
             return False
     return True
+
+
+async def _async_all_completed(tasks: list[asyncio.Future]) -> bool:
+    for future in asyncio.as_completed(tasks):
+        if not await future:
+            return False
+    return True
+
+
+def run_check(predicate, ctx):
+    """Calls the predicate with the context, reusing the result of a previous call
+    with the same predicate during the interaction.
+
+    Coroutine results are stored as tasks so that concurrent callers share one evaluation.
+    """
+    results = getattr(ctx, "_check_results", None)
+    if results is None:
+        return predicate(ctx)
+
+    result = results.get(predicate, MISSING)
+    if result is not MISSING and not (
+        isinstance(result, asyncio.Future) and result.cancelled()
+    ):
+        return result
+
+    result = predicate(ctx)
+    if inspect.isawaitable(result):
+        result = asyncio.ensure_future(result)
+    results[predicate] = result
+    return result
+
+
+async def async_all_concurrent(
+    predicates, *args, check=inspect.isawaitable, invoke=None
+):
+    """Evaluates the predicates concurrently and returns whether all of them passed.
+
+    Evaluation stops at the first predicate that fails or raises,
+    and the predicates still running are cancelled.
+    A predicate marked with ``__check_ordered__`` waits for all the predicates before it,
+    and the predicates after it wait for it.
+    ``invoke`` is called as ``invoke(predicate, *args)`` instead of ``predicate(*args)`` when given.
+    """
+    if invoke is None:
+
+        def invoke(func, *arguments):
+            return func(*arguments)
+
+    tasks = []
+    try:
+        for predicate in predicates:
+            if getattr(predicate, "__check_ordered__", False):
+                if not await _async_all_completed(tasks):
+                    return False
+                tasks = []
+
+                elem = invoke(predicate, *args)
+                if check(elem):
+                    elem = await elem
+                if not elem:
+                    return False
+                continue
+
+            elem = invoke(predicate, *args)
+            if check(elem):
+                tasks.append(asyncio.ensure_future(elem))
+            elif not elem:
+                return False
+        return await _async_all_completed(tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Retrieve the exception so that it is not logged as never retrieved.
+                task.exception()
@@ -0,0 +1,348 @@
+"""MIT License
+
+Copyright (c) 2021 gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+from abc import *
+from typing import Any, Callable
+
+
+class BaseWaiter(metaclass=ABCMeta):
+    """The custom_id, message id and user id a context must have to be delivered to a waiter.
+
+    Attributes
+    ----------
+    check: Optional[Callable[..., bool]]
+        A predicate the context must satisfy.
+    custom_id: Optional[str]
+        The custom_id the context must have.
+    message_id: Optional[int]
+        The id of the message the component must belong to.
+    user_id: Optional[int]
+        The id of the user who must send the context.
+    """
+
+    __slots__ = ("check", "custom_id", "message_id", "user_id", "timer")
+
+    def __init__(
+        self,
+        check: Callable[..., bool] | None = None,
+        custom_id: str | None = None,
+        message_id: int | None = None,
+        user_id: int | None = None,
+    ):
+        self.check = check
+        self.custom_id = custom_id
+        self.message_id = message_id
+        self.user_id = user_id
+        self.timer: asyncio.TimerHandle | None = None
+
+    def matches(self, ctx) -> bool:
+        """Whether the context has the custom_id, message id and user id of the waiter."""
+        if self.custom_id is not None and ctx.custom_id != self.custom_id:
+            return False
+        if self.message_id is not None and _get_message_id(ctx) != self.message_id:
+            return False
+        if self.user_id is not None and ctx.author.id != self.user_id:
+            return False
+        return True
+
+    def attach(self, registry: "WaiterRegistry", timeout: float | None = None):
+        """Called when the waiter is added to the registry."""
+        pass
+
+    def detach(self):
+        """Called when the waiter is removed from the registry."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    @abstractmethod
+    def deliver(self, ctx) -> bool:
+        pass
+
+
+class ComponentWaiter(BaseWaiter):
+    """A pending :meth:`Client.wait_for_component`.
+
+    Attributes
+    ----------
+    future: asyncio.Future
+        The future resolved with the matching context.
+    """
+
+    __slots__ = ("future",)
+
+    def __init__(self, future: asyncio.Future, check=None, **kwargs):
+        super().__init__(check, **kwargs)
+        self.future = future
+
+    def attach(self, registry: "WaiterRegistry", timeout: float | None = None):
+        """Removes the waiter from the registry when the future is done,
+        and makes the future time out after ``timeout`` seconds.
+        """
+        if timeout is not None:
+            self.timer = self.future.get_loop().call_later(timeout, self.expire)
+        self.future.add_done_callback(lambda _: registry.remove(self))
+
+    def deliver(self, ctx) -> bool:
+        """Resolves the future with the context if it satisfies the check.
+
+        Returns
+        -------
+            Whether the context was accepted.
+        """
+        if self.future.done():
+            return False
+        try:
+            result = self.check is None or self.check(ctx)
+        except Exception as exc:
+            self.future.set_exception(exc)
+            return False
+        if result:
+            self.future.set_result(ctx)
+        return bool(result)
+
+    def expire(self):
+        if not self.future.done():
+            self.future.set_exception(asyncio.TimeoutError())
+
+
+def _get_message_id(ctx) -> int | None:
+    message = getattr(ctx, "message", None)
+    return getattr(message, "id", None)
+
+
+class WaiterRegistry:
+    """Pending waiters indexed by the most specific of custom_id, message id and user id.
+
+    A waiter is removed as soon as its future is done, including when it is cancelled
+    or expires, so nothing is left behind by waiters that never match.
+    Expiry is scheduled with the timers of the event loop.
+    A :class:`ComponentStream` stays registered until it is closed.
+    """
+
+    def __init__(self):
+        self._custom_ids: dict[str, dict[Any, None]] = dict()
+        self._message_ids: dict[int, dict[Any, None]] = dict()
+        self._user_ids: dict[int, dict[Any, None]] = dict()
+        # Waiters without custom_id, message id and user id.
+        self._global: dict[Any, None] = dict()
+
+    def __len__(self) -> int:
+        return (
+            sum(len(x) for x in self._custom_ids.values())
+            + sum(len(x) for x in self._message_ids.values())
+            + sum(len(x) for x in self._user_ids.values())
+            + len(self._global)
+        )
+
+    def _get_index(self, waiter) -> tuple[dict | None, Any]:
+        if waiter.custom_id is not None:
+            return self._custom_ids, waiter.custom_id
+        if waiter.message_id is not None:
+            return self._message_ids, waiter.message_id
+        if waiter.user_id is not None:
+            return self._user_ids, waiter.user_id
+        return None, None
+
+    def add(self, waiter: BaseWaiter, timeout: float | None = None):
+        """Registers the waiter.
+
+        Parameters
+        ----------
+        waiter: Union[ComponentWaiter, ComponentStream]
+            The waiter to register.
+        timeout: Optional[float]
+            The number of seconds before the waiter expires.
+        """
+        index, key = self._get_index(waiter)
+        if index is None:
+            self._global[waiter] = None
+        else:
+            index.setdefault(key, dict())[waiter] = None
+
+        waiter.attach(self, timeout)
+
+    def remove(self, waiter: BaseWaiter):
+        """Unregisters the waiter. Removing a waiter twice does nothing."""
+        waiter.detach()
+
+        index, key = self._get_index(waiter)
+        if index is None:
+            self._global.pop(waiter, None)
+            return
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(waiter, None)
+        if len(bucket) == 0:
+            index.pop(key)
+
+    def get(self, ctx) -> list[BaseWaiter]:
+        """Returns the waiters whose custom_id, message id and user id match the context."""
+        waiters = []
+        for index, key in (
+            (self._custom_ids, ctx.custom_id),
+            (self._message_ids, _get_message_id(ctx)),
+            (self._user_ids, ctx.author.id),
+        ):
+            bucket = index.get(key)
+            if bucket is not None:
+                waiters += [waiter for waiter in bucket if waiter.matches(ctx)]
+        waiters += self._global
+        return waiters
+
+    def dispatch(self, ctx) -> int:
+        """Delivers the context to the matching waiters.
+
+        Returns
+        -------
+            The number of waiters which accepted the context.
+        """
+        if (
+            len(self._global) == 0
+            and len(self._custom_ids) == 0
+            and len(self._message_ids) == 0
+            and len(self._user_ids) == 0
+        ):
+            return 0
+
+        accepted = 0
+        for waiter in self.get(ctx):
+            if waiter.deliver(ctx):
+                accepted += 1
+        return accepted
+
+
+# Put in the queue of a stream when it is closed.
+_CLOSED = object()
+
+
+class ComponentStream(BaseWaiter):
+    """An asynchronous iterator over the contexts matching custom_id, message id and user id.
+
+    The stream is registered once and buffers the contexts in a bounded queue,
+    so contexts sent between iterations are not lost.
+    A context is not accepted while the queue is full.
+    The iteration stops when the stream is closed or no context is sent for ``idle_timeout`` seconds.
+
+    It should be used with ``async with`` to be closed when the iteration is stopped early.
+
+    .. code-block:: python
+
+        async with client.component_stream(message_id=message.id, idle_timeout=60) as stream:
+            async for ctx in stream:
+                await ctx.update(content=f"Page {ctx.custom_id}")
+
+    Attributes
+    ----------
+    idle_timeout: Optional[float]
+        The number of seconds without a context before the stream is closed.
+    max_size: int
+        The maximum number of contexts waiting in the queue.
+    """
+
+    __slots__ = ("idle_timeout", "max_size", "closed", "_queue", "_registry", "_loop")
+
+    def __init__(
+        self,
+        check: Callable[..., bool] | None = None,
+        idle_timeout: float | None = None,
+        max_size: int = 100,
+        **kwargs,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        super().__init__(check, **kwargs)
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self.closed = False
+        # The sentinel closing the stream is put beyond max_size.
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._registry: WaiterRegistry | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def attach(self, registry: WaiterRegistry, timeout: float | None = None):
+        self._registry = registry
+        self._loop = asyncio.get_running_loop()
+        if timeout is not None:
+            self.idle_timeout = timeout
+        self._reset_timer()
+
+    def _reset_timer(self):
+        if self.idle_timeout is None:
+            return
+        # The timer is pushed back by every accepted context.
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = self._loop.call_later(self.idle_timeout, self.close)
+
+    def deliver(self, ctx) -> bool:
+        """Puts the context in the queue if it satisfies the check and the queue is not full.
+
+        Returns
+        -------
+            Whether the context was accepted.
+        """
+        if self.closed or self._queue.qsize() >= self.max_size:
+            return False
+        try:
+            result = self.check is None or self.check(ctx)
+        except Exception as exc:
+            # The exception is raised by the iteration.
+            self._queue.put_nowait(exc)
+            return False
+        if result:
+            self._queue.put_nowait(ctx)
+            self._reset_timer()
+        return bool(result)
+
+    def close(self):
+        """Unregisters the stream. The contexts already in the queue are still iterated."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._registry is not None:
+            self._registry.remove(self)
+        else:
+            self.detach()
+        self._queue.put_nowait(_CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._queue.get()
+        if item is _CLOSED:
+            # Other iterations waiting on the stream are stopped as well.
+            self._queue.put_nowait(_CLOSED)
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
@@ -0,0 +1,73 @@
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    # Coroutine tests are run in a new event loop.
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return
+    arguments = {
+        name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames
+    }
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
+
+
+@pytest.fixture
+def make_context():
+    """Returns a factory of the attributes of a component context read by
+    waiters, streams, cooldowns and max concurrency.
+    """
+
+    def factory(custom_id: str = "button", message_id: int = 10, user_id: int = 20):
+        return SimpleNamespace(
+            custom_id=custom_id,
+            message=SimpleNamespace(id=message_id),
+            author=SimpleNamespace(id=user_id),
+        )
+
+    return factory
+
+
+@pytest.fixture
+def client():
+    from discord.ext import interaction
+
+    return interaction.Client()
+
+
+@pytest.fixture
+def make_payload():
+    """Returns a factory of INTERACTION_CREATE payloads sent from a guild."""
+
+    def factory(data: dict, interaction_type: int = 2, guild_id: str = "5") -> dict:
+        return {
+            "id": "1100000000000000000",
+            "type": interaction_type,
+            "token": "token",
+            "application_id": "1",
+            "guild_id": guild_id,
+            "channel_id": "6",
+            "channel": {"id": "6", "type": 0, "guild_id": guild_id},
+            "member": {
+                "user": {
+                    "id": "9",
+                    "username": "user",
+                    "discriminator": "0",
+                    "avatar": None,
+                },
+                "roles": ["7"],
+                "joined_at": None,
+                "flags": 0,
+                "permissions": "8192",
+            },
+            "app_permissions": "2048",
+            "locale": "en-US",
+            "data": data,
+        }
+
+    return factory
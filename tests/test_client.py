@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+from discord.ext import interaction
+
+
+async def receive(client: interaction.Client, payload: dict):
+    await client.on_socket_raw_receive(
+        json.dumps({"op": 0, "t": "INTERACTION_CREATE", "s": 1, "d": payload})
+    )
+    # Let the dispatched events run.
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_guild_only_command_is_invoked(client, make_payload):
+    await client._async_setup_hook()
+    invoked = []
+
+    @interaction.command(name="ping", description="Ping", guild_id=5)
+    async def ping(ctx):
+        invoked.append(ctx.name)
+
+    client.add_interaction(ping, sync_command=False)
+    await receive(client, make_payload({"id": "3", "name": "ping", "type": 1}))
+    assert invoked == ["ping"]
+
+
+async def test_command_of_another_guild_is_not_invoked(client, make_payload):
+    await client._async_setup_hook()
+    invoked = []
+
+    @interaction.command(name="ping", description="Ping", guild_id=5)
+    async def ping(ctx):
+        invoked.append(ctx.name)
+
+    client.add_interaction(ping, sync_command=False)
+    payload = make_payload({"id": "3", "name": "ping", "type": 1}, guild_id="8")
+    await receive(client, payload)
+    assert invoked == []
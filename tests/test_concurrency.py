@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from discord.ext.commands import BucketType, MaxConcurrencyReached
+
+from discord.ext.interaction.cooldown import MaxConcurrency
+
+
+async def test_semaphore_is_removed_after_release(make_context):
+    limiter = MaxConcurrency(1, BucketType.user, wait=False)
+    async with limiter.acquire(make_context()):
+        assert len(limiter) == 1
+    assert len(limiter) == 0
+
+
+async def test_semaphore_is_removed_after_error(make_context):
+    limiter = MaxConcurrency(1, BucketType.user, wait=False)
+    with pytest.raises(RuntimeError):
+        async with limiter.acquire(make_context()):
+            raise RuntimeError()
+    assert len(limiter) == 0
+
+
+async def test_limit_is_reached_without_wait(make_context):
+    limiter = MaxConcurrency(1, BucketType.user, wait=False)
+    async with limiter.acquire(make_context(user_id=1)):
+        with pytest.raises(MaxConcurrencyReached):
+            async with limiter.acquire(make_context(user_id=1)):
+                pass
+        # Another user has its own bucket.
+        async with limiter.acquire(make_context(user_id=2)):
+            assert len(limiter) == 2
+    assert len(limiter) == 0
+
+
+async def test_waiting_invocations_share_the_semaphore(make_context):
+    limiter = MaxConcurrency(1, BucketType.user, wait=True)
+    order = []
+
+    async def invoke(name: str):
+        async with limiter.acquire(make_context()):
+            order.append(name)
+            assert len(limiter) == 1
+            await asyncio.sleep(0)
+
+    await asyncio.gather(invoke("a"), invoke("b"), invoke("c"))
+    assert order == ["a", "b", "c"]
+    assert len(limiter) == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        MaxConcurrency(0, BucketType.user, wait=False)
+    with pytest.raises(TypeError):
+        MaxConcurrency(1, "user", wait=False)
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from discord.ext.commands import CommandOnCooldown
+
+from discord.ext.interaction.cooldown import (
+    CooldownBucket,
+    CooldownStorage,
+    MemoryCooldownStorage,
+    SQLiteCooldownStorage,
+    cooldown,
+    update_cooldowns,
+)
+
+
+def get_user_id(ctx) -> int:
+    return ctx.author.id
+
+
+def get_bucket(storage=None) -> CooldownBucket:
+    return CooldownBucket(2, 10.0, get_user_id, storage)
+
+
+async def test_memory_storage_sweeps_expired_buckets():
+    storage = MemoryCooldownStorage()
+    await storage.set("a", 1.0, 10.0)
+    await storage.set("b", 1.0, 20.0)
+    await storage.set("a", 0.0, 30.0)
+    await storage.sweep(25.0)
+
+    assert len(storage) == 1
+    assert await storage.get("a") == (0.0, 30.0)
+    assert await storage.get("b") is None
+
+
+async def test_bucket_takes_tokens_until_empty(make_context):
+    bucket = get_bucket()
+    ctx = make_context()
+    assert await bucket.update_rate_limit(ctx, current=100.0) is None
+    assert await bucket.update_rate_limit(ctx, current=100.0) is None
+    assert await bucket.update_rate_limit(ctx, current=100.0) == pytest.approx(5.0)
+
+
+async def test_bucket_refills_over_time(make_context):
+    bucket = get_bucket()
+    ctx = make_context()
+    await bucket.update_rate_limit(ctx, current=100.0)
+    await bucket.update_rate_limit(ctx, current=100.0)
+
+    assert await bucket.get_retry_after(ctx, current=102.5) == pytest.approx(2.5)
+    assert await bucket.get_retry_after(ctx, current=105.0) is None
+
+
+async def test_bucket_keys_are_separate(make_context):
+    bucket = get_bucket()
+    await bucket.update_rate_limit(make_context(user_id=1), current=100.0)
+    await bucket.update_rate_limit(make_context(user_id=1), current=100.0)
+    assert await bucket.get_retry_after(make_context(user_id=2), current=100.0) is None
+
+
+async def test_get_retry_after_does_not_take_a_token(make_context):
+    bucket = get_bucket()
+    for _ in range(5):
+        await bucket.get_retry_after(make_context(), current=100.0)
+    assert await bucket.storage.get("20") is None
+
+
+async def test_update_cooldowns_raises_when_empty(make_context):
+    decorator = cooldown(1, 60.0, get_user_id)
+    ctx = make_context()
+
+    assert await decorator.predicate(ctx)
+    await update_cooldowns(ctx, decorator.predicate)
+    with pytest.raises(CommandOnCooldown):
+        await decorator.predicate(ctx)
+    with pytest.raises(CommandOnCooldown):
+        await update_cooldowns(ctx, decorator.predicate)
+
+
+async def test_sqlite_storage_persists_buckets(tmp_path, make_context):
+    path = str(tmp_path / "cooldown.db")
+    storage = SQLiteCooldownStorage(path, commit_interval=60.0)
+    await get_bucket(storage).update_rate_limit(make_context(), current=100.0)
+    storage.close()
+
+    storage = SQLiteCooldownStorage(path)
+    assert await storage.get("20") == (1.0, 100.0)
+    storage.close()
+
+
+class SlowStorage(CooldownStorage):
+    """A storage suspending between reading and writing, like a remote one."""
+
+    def __init__(self):
+        self.buckets = dict()
+
+    async def get(self, key: str):
+        await asyncio.sleep(0.01)
+        return self.buckets.get(key)
+
+    async def set(self, key: str, tokens: float, updated_at: float):
+        await asyncio.sleep(0.01)
+        self.buckets[key] = (tokens, updated_at)
+
+    async def sweep(self, before: float):
+        pass
+
+
+@pytest.mark.parametrize(
+    "storage",
+    [MemoryCooldownStorage, SQLiteCooldownStorage, SlowStorage],
+    ids=["memory", "sqlite", "default"],
+)
+async def test_concurrent_invocations_take_one_token(storage, make_context):
+    bucket = CooldownBucket(1, 60.0, get_user_id, storage())
+    results = await asyncio.gather(
+        *[bucket.update_rate_limit(make_context(), current=100.0) for _ in range(5)]
+    )
+    assert results.count(None) == 1
+    if isinstance(bucket.storage, SQLiteCooldownStorage):
+        bucket.storage.close()
@@ -0,0 +1,119 @@
+from discord.ext.interaction.commands import SlashCommand
+from discord.ext.interaction.diff import (
+    FieldChange,
+    diff_command,
+    diff_commands,
+    normalize_command,
+)
+
+
+def get_remote(name: str = "ping", command_id: str = "100", **fields) -> dict:
+    data = {
+        "id": command_id,
+        "application_id": "1",
+        "version": "2",
+        "type": 1,
+        "name": name,
+        "description": "Ping",
+        "options": [
+            {"type": 3, "name": "text", "description": "Text", "required": True}
+        ],
+    }
+    data.update(fields)
+    return data
+
+
+def get_local(name: str = "ping", **fields) -> dict:
+    data = get_remote(name, **fields)
+    for key in ("id", "application_id", "version"):
+        data.pop(key)
+    return data
+
+
+def test_normalize_command_removes_remote_fields_and_defaults():
+    data = normalize_command(
+        {
+            "id": "1",
+            "version": "1",
+            "name": "ping",
+            "description": None,
+            "options": [
+                {
+                    "type": 3,
+                    "name": "text",
+                    "description": "Text",
+                    "required": False,
+                    "autocomplete": False,
+                    "choices": [],
+                    "channel_types": [2, 0],
+                }
+            ],
+        }
+    )
+    assert data == {
+        "description": "",
+        "name": "ping",
+        "options": [
+            {
+                "name": "text",
+                "type": 3,
+                "description": "Text",
+                "channel_types": [0, 2],
+            }
+        ],
+        "type": 1,
+    }
+
+
+def test_normalize_command_of_application_command_is_memoized():
+    command = SlashCommand(name="ping", description="Ping")
+    assert normalize_command(command) is normalize_command(command)
+
+    command.description = "Pong"
+    assert normalize_command(command)["description"] == "Pong"
+
+
+def test_same_commands_have_no_change():
+    assert diff_command(get_local(), get_remote()) is None
+
+
+def test_changed_option_is_reported_by_path():
+    local = get_local()
+    local["options"][0]["description"] = "Changed"
+    change = diff_command(local, get_remote())
+
+    assert change.action == "patch"
+    assert change.id == 100
+    assert change.fields == [FieldChange("options.text.description", "Text", "Changed")]
+    assert change.payload == {"options": normalize_command(local)["options"]}
+
+
+def test_reordered_options_are_reported():
+    options = [
+        {"type": 3, "name": "a", "description": "A"},
+        {"type": 3, "name": "b", "description": "B"},
+    ]
+    change = diff_command(get_local(options=options), get_remote(options=options[::-1]))
+    assert change.fields == [FieldChange("options (order)", ["b", "a"], ["a", "b"])]
+
+
+def test_diff_commands_orders_creations_patches_and_deletions():
+    local = [get_local("new"), get_local("ping", description="Changed")]
+    remote = [get_remote("ping"), get_remote("old", command_id="200")]
+    diff = diff_commands(local, remote)
+
+    assert [(x.action, x.name, x.id) for x in diff.changes] == [
+        ("create", "new", None),
+        ("patch", "ping", 100),
+        ("delete", "old", 200),
+    ]
+    assert diff.unchanged == 0
+    assert "1 to create, 1 to patch, 1 to delete, 0 unchanged." in diff.report()
+
+
+def test_diff_commands_keeps_missing_commands():
+    diff = diff_commands(
+        [get_local()], [get_remote(), get_remote("old")], delete_missing=False
+    )
+    assert not diff
+    assert diff.unchanged == 1
@@ -0,0 +1,94 @@
+import discord
+import pytest
+from discord.ext.commands import BotMissingPermissions, MissingPermissions
+
+from discord.ext import interaction
+
+
+def get_nested_data() -> dict:
+    return {
+        "id": "3",
+        "name": "root",
+        "type": 1,
+        "options": [
+            {
+                "name": "grp",
+                "type": 2,
+                "options": [
+                    {
+                        "name": "sub",
+                        "type": 1,
+                        "options": [{"name": "text", "type": 3, "value": "a"}],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def test_nested_subcommands_build_the_payload_once(make_payload):
+    client = interaction.Client(payload_cache_size=10)
+    stored = []
+    store = client.payload_cache.store
+    client.payload_cache.store = lambda payload: stored.append(store(payload))
+    looked_up = []
+    get_guild = client.get_guild
+    client.get_guild = lambda guild_id: looked_up.append(get_guild(guild_id))
+
+    ctx = interaction.ApplicationContext(make_payload(get_nested_data()), client)
+    group = ctx.options["subcommand_group"]
+    sub_command = group.options["subcommand"]
+
+    assert len(stored) == 1
+    assert len(looked_up) == 1
+    assert sub_command.options == {"text": "a"}
+    assert sub_command.author is ctx.author
+    assert sub_command.command_id == 3
+
+
+def test_nested_subcommands_share_the_lookups(client, make_payload):
+    ctx = interaction.ApplicationContext(make_payload(get_nested_data()), client)
+    sub_command = ctx.options["subcommand_group"].options["subcommand"]
+
+    # The channel is looked up lazily, from the subcommand context first.
+    assert sub_command.channel is ctx.channel
+    assert sub_command.guild is ctx.guild
+    assert sub_command.author_role_ids is ctx.author_role_ids
+
+
+def test_cacheless_author_uses_the_payload_permissions(make_payload):
+    client = interaction.Client(cacheless_context=True)
+    ctx = interaction.ApplicationContext(make_payload(get_nested_data()), client)
+
+    assert isinstance(ctx.author, interaction.PartialMember)
+    assert ctx.author.guild_permissions.value == 8192
+    with pytest.raises(discord.ClientException):
+        ctx.author.top_role
+
+
+async def test_cacheless_role_bucket_uses_the_role_ids(make_payload):
+    client = interaction.Client(cacheless_context=True)
+    ctx = interaction.ApplicationContext(make_payload(get_nested_data()), client)
+    bucket = interaction.CooldownBucket(1, 10, interaction.BucketType.role)
+
+    assert await bucket.update_rate_limit(ctx, current=0) is None
+    assert await bucket.update_rate_limit(ctx, current=1) is not None
+
+
+def get_predicate(decorator):
+    def func():
+        pass
+
+    return decorator(func).__commands_checks__[0]
+
+
+def test_cacheless_guild_permission_checks_use_the_payload(make_payload):
+    client = interaction.Client(cacheless_context=True)
+    ctx = interaction.ApplicationContext(make_payload(get_nested_data()), client)
+
+    assert get_predicate(interaction.has_guild_permissions(manage_messages=True))(ctx)
+    assert get_predicate(interaction.bot_has_guild_permissions(send_messages=True))(ctx)
+    with pytest.raises(MissingPermissions):
+        get_predicate(interaction.has_guild_permissions(administrator=True))(ctx)
+    with pytest.raises(BotMissingPermissions):
+        get_predicate(interaction.bot_has_guild_permissions(manage_messages=True))(ctx)
@@ -0,0 +1,68 @@
+import json
+
+from discord.ext.interaction.commands import CommandOption, SlashCommand
+from discord.ext.interaction.manifest import (
+    get_fingerprint,
+    get_manifest,
+    load_sync_state,
+    save_sync_state,
+)
+
+
+def get_commands() -> list[SlashCommand]:
+    guild_command = SlashCommand(name="b", description="guild", guild_id=10)
+    guild_command.id = 200
+    global_command = SlashCommand(
+        name="a",
+        description="global",
+        options=[CommandOption(name="value", option_type=str, required=True)],
+    )
+    global_command.id = 100
+    return [guild_command, global_command]
+
+
+def test_manifest_is_sorted_by_scope():
+    manifest = get_manifest(get_commands())
+    assert [(x.get("guild_id"), x["name"]) for x in manifest] == [
+        (None, "a"),
+        ("10", "b"),
+    ]
+
+
+def test_fingerprint_ignores_key_order():
+    assert get_fingerprint({"a": 1, "b": [1, 2]}) == get_fingerprint(
+        {"b": [1, 2], "a": 1}
+    )
+    assert get_fingerprint({"a": 1}) != get_fingerprint({"a": 2})
+
+
+def test_fingerprint_survives_a_json_round_trip():
+    manifest = get_manifest(get_commands())
+    loaded = json.loads(json.dumps(manifest))
+    assert get_fingerprint(loaded) == get_fingerprint(manifest)
+
+
+def test_sync_state_round_trip(tmp_path):
+    path = tmp_path / "state.json"
+    commands = get_commands()
+    fingerprint = get_fingerprint(get_manifest(commands))
+    save_sync_state(path, fingerprint, commands)
+
+    state = load_sync_state(path)
+    assert state["fingerprint"] == fingerprint
+    assert state["commands"] == [
+        {"type": 1, "name": "b", "guild_id": "10", "id": "200", "version": "1"},
+        {"type": 1, "name": "a", "guild_id": None, "id": "100", "version": "1"},
+    ]
+    assert not (tmp_path / "state.json.tmp").exists()
+
+
+def test_invalid_sync_state_is_ignored(tmp_path):
+    assert load_sync_state(tmp_path / "missing.json") is None
+
+    path = tmp_path / "state.json"
+    path.write_text("not json", encoding="utf-8")
+    assert load_sync_state(path) is None
+
+    path.write_text('{"commands": []}', encoding="utf-8")
+    assert load_sync_state(path) is None
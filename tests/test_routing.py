@@ -0,0 +1,89 @@
+import pytest
+
+from discord.ext.interaction.components import DetectComponent
+from discord.ext.interaction.routing import CustomIdPattern, CustomIdRouter
+
+
+def test_pattern_converts_segments():
+    pattern = CustomIdPattern("vote:{poll_id:int}:{choice}")
+    assert pattern.literal == "vote:"
+    assert pattern.match("vote:12:yes") == {"poll_id": 12, "choice": "yes"}
+    assert pattern.match("vote:abc:yes") is None
+    assert pattern.match("vote:12") is None
+
+
+def test_pattern_without_segments_is_exact():
+    pattern = CustomIdPattern("menu")
+    assert pattern.match("menu") == {}
+    assert pattern.match("menu:1") is None
+
+
+def test_prefix_pattern():
+    assert CustomIdPattern("page:", prefix=True).match("page:3") == {}
+    assert CustomIdPattern("page:{page:int}", prefix=True).match("page:3:next") == {
+        "page": 3
+    }
+    assert CustomIdPattern("page:", prefix=True).match("menu") is None
+
+
+def test_float_and_negative_segments():
+    pattern = CustomIdPattern("{x:float},{y:int}")
+    assert pattern.match("-1.5,-2") == {"x": -1.5, "y": -2}
+
+
+@pytest.mark.parametrize(
+    "pattern", ["{value:bytes}", "{value}:{value}"], ids=["type", "duplicate"]
+)
+def test_invalid_pattern(pattern):
+    with pytest.raises(ValueError):
+        CustomIdPattern(pattern)
+
+
+def test_router_matches_shorter_literals_first():
+    router = CustomIdRouter()
+    router.add(CustomIdPattern("vote:{poll_id:int}"), "poll")
+    router.add(CustomIdPattern("{anything}"), "any")
+    router.add(CustomIdPattern("vote:1{rest}"), "one")
+    router.add(CustomIdPattern("menu:", prefix=True), "menu")
+
+    assert router.match("vote:12") == [
+        ("any", {"anything": "vote:12"}),
+        ("poll", {"poll_id": 12}),
+        ("one", {"rest": "2"}),
+    ]
+    assert router.match("menu:open") == [
+        ("any", {"anything": "menu:open"}),
+        ("menu", {}),
+    ]
+    assert len(router) == 4
+
+
+def test_router_remove():
+    router = CustomIdRouter()
+    first, second = object(), object()
+    router.add(CustomIdPattern("vote:{poll_id:int}"), first)
+    router.add(CustomIdPattern("vote:{poll_id:int}"), second)
+    router.add(CustomIdPattern("vote:{poll_id}:{choice}"), first)
+
+    assert router.remove("vote:{poll_id:int}", second) == [second]
+    assert router.values() == {
+        "vote:{poll_id:int}": [first],
+        "vote:{poll_id}:{choice}": [first],
+    }
+    assert router.remove("vote:{poll_id:int}") == [first]
+    assert router.remove("missing:{x}") == []
+    assert len(router) == 1
+    assert router.match("vote:1") == []
+
+
+def test_detect_component_templates_are_opt_in():
+    async def callback(ctx):
+        pass
+
+    assert DetectComponent(callback, custom_id="{literal}").custom_id_pattern is None
+
+    component = DetectComponent(callback, custom_id="vote:{poll_id:int}", pattern=True)
+    assert component.custom_id_pattern.match("vote:3") == {"poll_id": 3}
+
+    component = DetectComponent(callback, custom_id="page:", prefix=True)
+    assert component.custom_id_pattern.match("page:3") == {}
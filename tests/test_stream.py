@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from discord.ext.interaction.waiter import ComponentStream, WaiterRegistry
+
+
+async def collect(stream: ComponentStream) -> list[str]:
+    return [ctx.custom_id async for ctx in stream]
+
+
+async def test_stream_closes_after_idle_timeout(make_context):
+    registry = WaiterRegistry()
+    stream = ComponentStream(idle_timeout=0.05, message_id=10)
+    registry.add(stream)
+    registry.dispatch(make_context("a"))
+    registry.dispatch(make_context("b"))
+
+    assert await asyncio.wait_for(collect(stream), 1.0) == ["a", "b"]
+    assert stream.closed
+    assert stream.timer is None
+    assert len(registry) == 0
+
+
+async def test_idle_timer_is_reset_by_contexts(make_context):
+    registry = WaiterRegistry()
+    stream = ComponentStream(idle_timeout=0.1)
+    registry.add(stream)
+
+    async def send():
+        for custom_id in ("a", "b", "c"):
+            await asyncio.sleep(0.06)
+            registry.dispatch(make_context(custom_id))
+
+    result, _ = await asyncio.gather(collect(stream), send())
+    assert result == ["a", "b", "c"]
+
+
+async def test_stream_is_bounded(make_context):
+    registry = WaiterRegistry()
+    stream = ComponentStream(max_size=2)
+    registry.add(stream)
+
+    assert registry.dispatch(make_context("a")) == 1
+    assert registry.dispatch(make_context("b")) == 1
+    assert registry.dispatch(make_context("c")) == 0
+    stream.close()
+    assert await collect(stream) == ["a", "b"]
+
+
+async def test_context_manager_closes_the_stream(make_context):
+    registry = WaiterRegistry()
+    async with ComponentStream(custom_id="button") as stream:
+        registry.add(stream)
+        registry.dispatch(make_context())
+        async for ctx in stream:
+            break
+
+    assert ctx.custom_id == "button"
+    assert stream.closed
+    assert len(registry) == 0
+
+
+async def test_check_exception_is_raised_by_the_iteration(make_context):
+    def check(ctx):
+        raise RuntimeError()
+
+    registry = WaiterRegistry()
+    stream = ComponentStream(check)
+    registry.add(stream)
+
+    assert registry.dispatch(make_context()) == 0
+    with pytest.raises(RuntimeError):
+        await stream.__anext__()
+    stream.close()
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        ComponentStream(max_size=0)
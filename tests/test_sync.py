@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import discord
+
+from discord.ext import interaction
+
+
+class FakeHTTP:
+    """The command endpoints of :class:`discord.http.HTTPClient` used by the sync."""
+
+    def __init__(self, remote: list[dict], fail_edit: bool = False):
+        self.remote = remote
+        self.fail_edit = fail_edit
+        self.requests = []
+
+    async def get_global_commands(self, application_id):
+        self.requests.append("GET")
+        return self.remote
+
+    async def upsert_global_command(self, application_id, payload):
+        self.requests.append("POST")
+        return dict(payload, id="20", application_id="1", version="1")
+
+    async def edit_global_command(self, application_id, command_id, payload):
+        self.requests.append("PATCH")
+        if self.fail_edit:
+            response = SimpleNamespace(status=400, reason="Bad Request")
+            raise discord.HTTPException(response, {"message": "Invalid", "code": 0})
+        return dict(self.remote[0], **payload)
+
+
+def get_remote(description: str = "Old") -> list[dict]:
+    return [
+        {
+            "id": "10",
+            "application_id": "1",
+            "version": "1",
+            "type": 1,
+            "name": "ping",
+            "description": description,
+        }
+    ]
+
+
+def get_client(http: FakeHTTP, **options) -> interaction.Client:
+    client = interaction.Client(global_sync_command=True, **options)
+    client.interaction_http.http = http
+    client._application_id_value = 1
+
+    @interaction.command(name="ping", description="Ping")
+    async def ping(ctx):
+        pass
+
+    client.add_interaction(ping, sync_command=True)
+    return client
+
+
+async def test_sync_returns_failed_operations():
+    http = FakeHTTP(get_remote(), fail_edit=True)
+    client = get_client(http)
+    await client._async_setup_hook()
+
+    reports = await client._sync_command_queue()
+    assert len(reports) == 1
+    assert [x.change.action for x in reports[0].failed] == ["patch"]
+    assert isinstance(reports[0].failed[0].error, discord.HTTPException)
+
+
+async def test_sync_without_changes_returns_no_report():
+    http = FakeHTTP(get_remote("Ping"))
+    client = get_client(http)
+    await client._async_setup_hook()
+
+    assert await client._sync_command_queue() == []
+    assert http.requests == ["GET"]
+
+
+async def test_failed_sync_removes_the_state(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"fingerprint": "stale", "commands": []}', encoding="utf-8")
+    client = get_client(FakeHTTP(get_remote(), fail_edit=True), sync_state_path=path)
+    await client._async_setup_hook()
+
+    await client._sync_command_startup()
+    assert not path.exists()
+
+
+async def test_successful_sync_is_skipped_on_restart(tmp_path):
+    path = tmp_path / "state.json"
+    client = get_client(FakeHTTP(get_remote()), sync_state_path=path)
+    await client._async_setup_hook()
+    await client._sync_command_startup()
+    assert path.exists()
+
+    http = FakeHTTP(get_remote())
+    client = get_client(http, sync_state_path=path)
+    await client._async_setup_hook()
+    await client._sync_command_startup()
+    assert http.requests == []
+    assert client.get_interaction()[0].id == 10
+
+
+class FakeBulkHTTP(FakeHTTP):
+    async def bulk_upsert_global_commands(self, application_id, payload):
+        self.requests.append("PUT")
+        self.payload = payload
+        return [dict(x, id=x.get("id", "20"), application_id="1") for x in payload]
+
+
+async def test_bulk_sync_keeps_unmodeled_fields():
+    other = {
+        "id": "11",
+        "application_id": "1",
+        "version": "1",
+        "type": 1,
+        "name": "other",
+        "description": "Other",
+        "integration_types": [0, 1],
+        "contexts": [0],
+        "nsfw": True,
+    }
+    http = FakeBulkHTTP(get_remote() + [other])
+    client = get_client(http, bulk_sync_command=True)
+
+    @interaction.command(name="other", description="Other")
+    async def other_command(ctx):
+        pass
+
+    client.add_interaction(other_command, sync_command=False)
+    await client._async_setup_hook()
+
+    await client._sync_command_queue()
+    assert http.requests == ["GET", "PUT"]
+    assert other in http.payload
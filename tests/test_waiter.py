@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from discord.ext.interaction.waiter import ComponentWaiter, WaiterRegistry
+
+
+def add_waiter(registry: WaiterRegistry, timeout=None, check=None, **kwargs):
+    future = asyncio.get_running_loop().create_future()
+    registry.add(ComponentWaiter(future, check, **kwargs), timeout)
+    return future
+
+
+async def test_waiter_is_removed_after_timeout():
+    registry = WaiterRegistry()
+    future = add_waiter(registry, timeout=0.01, custom_id="button")
+    assert len(registry) == 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await future
+    assert len(registry) == 0
+    assert registry._custom_ids == {}
+
+
+async def test_waiter_is_removed_after_cancel():
+    registry = WaiterRegistry()
+    future = add_waiter(registry, timeout=60.0, user_id=20)
+    waiter = next(iter(registry._user_ids[20]))
+
+    future.cancel()
+    await asyncio.sleep(0)
+    assert len(registry) == 0
+    assert waiter.timer is None
+
+
+async def test_waiter_is_removed_after_delivery(make_context):
+    registry = WaiterRegistry()
+    future = add_waiter(registry, timeout=60.0, message_id=10)
+    ctx = make_context()
+
+    assert registry.dispatch(ctx) == 1
+    assert await future is ctx
+    # The waiter is removed by the done callback of the future.
+    await asyncio.sleep(0)
+    assert len(registry) == 0
+
+
+async def test_dispatch_matches_every_key(make_context):
+    registry = WaiterRegistry()
+    matching = add_waiter(registry, custom_id="button", message_id=10, user_id=20)
+    other_user = add_waiter(registry, custom_id="button", user_id=21)
+    other_message = add_waiter(registry, message_id=11)
+    every = add_waiter(registry)
+
+    assert registry.dispatch(make_context()) == 2
+    await asyncio.sleep(0)
+    assert matching.done()
+    assert every.done()
+    assert not other_user.done()
+    assert not other_message.done()
+    assert len(registry) == 2
+
+
+async def test_check_exception_is_set_on_the_future(make_context):
+    def check(ctx):
+        raise RuntimeError()
+
+    registry = WaiterRegistry()
+    future = add_waiter(registry, check=check)
+
+    assert registry.dispatch(make_context()) == 0
+    with pytest.raises(RuntimeError):
+        await future
+    await asyncio.sleep(0)
+    assert len(registry) == 0
+
+
+async def test_rejected_context_keeps_the_waiter(make_context):
+    registry = WaiterRegistry()
+    future = add_waiter(registry, check=lambda ctx: ctx.author.id == 1)
+
+    assert registry.dispatch(make_context()) == 0
+    assert not future.done()
+    assert len(registry) == 1